@@ -24,6 +24,7 @@ def run_scheduler():
         print("❌ Configuration validation failed. Please check your .env file.")
         return False
 
+    coordinator = None
     try:
         # Initialize coordinator
         coordinator = LeetcodeEmailCoordinator()
@@ -76,6 +77,10 @@ def run_scheduler():
         print(f"❌ Error running scheduler: {e}")
         return False
 
+    finally:
+        if coordinator:
+            coordinator.shutdown()
+
 def run_once():
     """Run the email processing once immediately."""
     print("🚀 Running LeetCode Email Agent once...")
@@ -85,6 +90,7 @@ def run_once():
         print("❌ Configuration validation failed. Please check your .env file.")
         return False
 
+    coordinator = None
     try:
         # Initialize coordinator
         coordinator = LeetcodeEmailCoordinator()
@@ -113,10 +119,15 @@ def run_once():
         print(f"❌ Error running email processing: {e}")
         return False
 
+    finally:
+        if coordinator:
+            coordinator.shutdown()
+
 def initialize_data():
     """Initialize the database with sample problems."""
     print("🚀 Initializing sample data...")
 
+    coordinator = None
     try:
         coordinator = LeetcodeEmailCoordinator()
 
@@ -141,10 +152,15 @@ def initialize_data():
         print(f"❌ Error initializing data: {e}")
         return False
 
+    finally:
+        if coordinator:
+            coordinator.shutdown()
+
 def test_system():
     """Test all system components."""
     print("🚀 Testing LeetCode Email Agent system...")
 
+    coordinator = None
     try:
         coordinator = LeetcodeEmailCoordinator()
 
@@ -174,6 +190,10 @@ def test_system():
         print(f"❌ Error testing system: {e}")
         return False
 
+    finally:
+        if coordinator:
+            coordinator.shutdown()
+
 def show_config():
     """Show current configuration."""
     print("🚀 LeetCode Email Agent Configuration:")
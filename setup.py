@@ -22,8 +22,8 @@ def check_python_version():
     """Check if Python version is compatible."""
     print("🔍 Checking Python version...")
 
-    if sys.version_info < (3, 9):
-        print("❌ Python 3.9 or higher is required.")
+    if sys.version_info < (3, 10):
+        print("❌ Python 3.10 or higher is required.")
         print(f"   Current version: {sys.version}")
         print("   Please upgrade Python and try again.")
         return False
@@ -163,6 +163,7 @@ def initialize_database():
     """Initialize the database with sample data."""
     print("\n🗄️ Initializing database...")
 
+    coordinator = None
     try:
         # Import here to avoid issues if dependencies aren't installed yet
         sys.path.append("src")
@@ -190,10 +191,15 @@ def initialize_database():
         print("   You can initialize it later with: python main.py --init-data")
         return False
 
+    finally:
+        if coordinator:
+            coordinator.shutdown()
+
 def test_system():
     """Test the system configuration."""
     print("\n🧪 Testing system...")
 
+    coordinator = None
     try:
         sys.path.append("src")
         from coordinator import LeetcodeEmailCoordinator
@@ -216,6 +222,10 @@ def test_system():
         print(f"❌ Error testing system: {e}")
         return False
 
+    finally:
+        if coordinator:
+            coordinator.shutdown()
+
 def show_next_steps():
     """Show next steps to the user."""
     print("\n" + "=" * 60)
@@ -2,7 +2,6 @@
 Leetcode Email Agent - Main package initialization.
 """
 
-from .coordinator import LeetcodeEmailCoordinator
 from .config import Config
 
 __version__ = "1.0.0"
@@ -10,3 +9,12 @@ __author__ = "Leetcode Email Agent Team"
 __description__ = "AI-driven automated system that delivers daily LeetCode-style coding problems via email"
 
 __all__ = ["LeetcodeEmailCoordinator", "Config"]
+
+
+def __getattr__(name):
+    # The coordinator pulls in every agent (Groq, SMTP, scheduler); import it
+    # on first access so that `src.config` stays cheap to load
+    if name == "LeetcodeEmailCoordinator":
+        from .coordinator import LeetcodeEmailCoordinator
+        return LeetcodeEmailCoordinator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
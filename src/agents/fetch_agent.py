@@ -6,7 +6,7 @@ This agent is responsible for retrieving coding problems from the data source.
 import json
 import os
 import logging
-from typing import Optional, List
+from typing import Optional, List, Collection
 from datetime import datetime
 
 try:
@@ -184,12 +184,16 @@ class FetchAgent:
             logger.error(f"Error fetching all problems: {e}")
             return []
 
-    def get_problems_by_difficulty(self, difficulty: str) -> List[Problem]:
+    def get_problems_by_difficulty(self, difficulty: str, count: Optional[int] = None,
+                                   exclude_titles: Optional[Collection[str]] = None) -> List[Problem]:
         """
-        Get all problems of a specific difficulty.
+        Get problems of a specific difficulty.
 
         Args:
             difficulty: The difficulty level (easy, medium, hard)
+            count: Maximum number of problems to return (default: all)
+            exclude_titles: Titles to skip, e.g. problems already stored;
+                applied before the count limit
 
         Returns:
             List of Problem objects
@@ -199,6 +203,12 @@ class FetchAgent:
             filtered_problems = []
 
             for problem_data in problems_data:
+                if count is not None and len(filtered_problems) >= count:
+                    break
+
+                if exclude_titles and problem_data.get('title', '') in exclude_titles:
+                    continue
+
                 if problem_data.get('difficulty', '').lower() == difficulty.lower():
                     problem = Problem(
                         title=problem_data.get('title', ''),
@@ -252,6 +262,15 @@ class FetchAgent:
         self._problems_cache = None
         logger.info("Problems cache refreshed")
 
+    def has_problems(self) -> bool:
+        """
+        Check whether any problems are available, without building statistics.
+
+        Returns:
+            True if at least one problem is available, False otherwise
+        """
+        return bool(self._load_problems())
+
     def get_stats(self) -> dict:
         """
         Get statistics about available problems.
@@ -4,6 +4,7 @@ This agent handles sending emails with coding problems and solutions.
 """
 
 import logging
+import threading
 import yagmail
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -27,6 +28,9 @@ class MailAgent:
 
     def __init__(self):
         """Initialize the Mail Agent with email configuration."""
+        # The SMTP connection is shared, so sends from worker threads go one at a time
+        self._send_lock = threading.Lock()
+
         try:
             self.smtp = yagmail.SMTP(
                 user=Config.EMAIL_ADDRESS,
@@ -60,11 +64,12 @@ class MailAgent:
             text_content = self._generate_text_content(user, problem, solution)
 
             # Send email
-            self.smtp.send(
-                to=user.email,
-                subject=subject,
-                contents=[text_content, html_content]
-            )
+            with self._send_lock:
+                self.smtp.send(
+                    to=user.email,
+                    subject=subject,
+                    contents=[text_content, html_content]
+                )
 
             logger.info(f"Successfully sent daily problem '{problem.title}' to {user.email}")
             return True
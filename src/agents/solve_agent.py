@@ -3,9 +3,19 @@ Solve Agent for the Leetcode Email Agent.
 This agent uses Groq API to generate solutions for coding problems.
 """
 
+import json
 import logging
+import re
+import threading
+from dataclasses import replace
 from typing import Optional, Dict, Any
-from groq import Groq
+import httpx
+from cachetools import LRUCache
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser also accepts bytes
+    from json import loads as json_loads
 
 try:
     from ..database.models import Problem, Solution
@@ -18,6 +28,52 @@ except ImportError:
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# Sentinel the model is asked to emit after the APPROACH section. Passing it as a
+# stop sequence lets Groq end generation there instead of producing extra prose.
+END_SENTINEL = "END_SOLUTION"
+
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODEL = "llama3-8b-8192"  # Using Llama3 model (Mixtral was decommissioned)
+
+SYSTEM_MESSAGE = (
+    "You are an expert software engineer and competitive programmer. "
+    "Provide clear, efficient, and well-commented solutions to coding problems."
+)
+
+# Request body shared by every solution call, serialized once at import time.
+# Only the user prompt changes per call, so it is spliced in between the two halves.
+_USER_PLACEHOLDER = "__USER__"
+_BODY_PREFIX, _BODY_SUFFIX = json.dumps({
+    "model": GROQ_MODEL,
+    "messages": [
+        {"role": "system", "content": SYSTEM_MESSAGE},
+        {"role": "user", "content": _USER_PLACEHOLDER}
+    ],
+    "temperature": 0.3,  # Lower temperature for more consistent code generation
+    "max_tokens": 2000,
+    "top_p": 1,
+    "stream": False,
+    "stop": [END_SENTINEL]  # Stop once all required sections are emitted
+}).encode("utf-8").split(json.dumps(_USER_PLACEHOLDER).encode("utf-8"))
+
+# Number of generated solutions kept, keyed by (problem ID, language)
+SOLUTION_CACHE_SIZE = 512
+
+# Matches the section headers requested in the prompt, e.g. "TIME COMPLEXITY:"
+_SECTION_HEADER_RE = re.compile(
+    r'^\s*(solution|explanation|time complexity|space complexity|approach)\s*:',
+    re.IGNORECASE
+)
+
+# Maps a section header to the key it populates in the parsed result
+_SECTION_KEYS = {
+    "solution": "code",
+    "explanation": "explanation",
+    "time complexity": "time_complexity",
+    "space complexity": "space_complexity",
+    "approach": "approach"
+}
+
 class SolveAgent:
     """
     Agent responsible for generating solutions to coding problems using Groq API.
@@ -25,9 +81,26 @@ class SolveAgent:
     """
 
     def __init__(self):
-        """Initialize the Solve Agent with Groq client."""
+        """Initialize the Solve Agent with a pooled HTTP client for the Groq API."""
+        # Users sharing a (problem, language) pair share one generated solution
+        self._solution_cache = LRUCache(maxsize=SOLUTION_CACHE_SIZE)
+        self._cache_lock = threading.Lock()
+
+        # Building an httpx.Client never fails, so check the key up front; the
+        # Groq SDK used to reject a missing key here rather than on the first call
+        if not Config.GROQ_API_KEY:
+            logger.error("Failed to initialize SolveAgent: GROQ_API_KEY is not set")
+            self.client = None
+            return
+
         try:
-            self.client = Groq(api_key=Config.GROQ_API_KEY)
+            self.client = httpx.Client(
+                headers={
+                    "Authorization": f"Bearer {Config.GROQ_API_KEY}",
+                    "Content-Type": "application/json"
+                },
+                timeout=60.0
+            )
             logger.info("SolveAgent initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize SolveAgent: {e}")
@@ -130,6 +203,10 @@ SPACE COMPLEXITY:
 
 APPROACH:
 [Step-by-step breakdown of the solution approach]
+
+{END_SENTINEL}
+
+Write {END_SENTINEL} on its own line immediately after the APPROACH section and nothing after it.
 """
 
         return prompt
@@ -155,35 +232,32 @@ APPROACH:
                 logger.warning(f"Unsupported language: {language}. Using Python instead.")
                 language = "python"
 
+            # Reuse a solution already generated for this problem and language.
+            # Callers mutate solutions (e.g. HumorAgent), so hand out copies.
+            cache_key = (problem.id, language.lower())
+            if problem.id is not None:
+                with self._cache_lock:
+                    cached = self._solution_cache.get(cache_key)
+                if cached:
+                    logger.info(f"Using cached solution for '{problem.title}' in {language}")
+                    return replace(cached)
+
             # Create the prompt
             prompt = self._create_solution_prompt(problem, language)
 
             logger.info(f"Generating solution for '{problem.title}' in {language}")
 
             # Call Groq API
-            response = self.client.chat.completions.create(
-                model="llama3-8b-8192",  # Using Llama3 model (Mixtral was decommissioned)
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert software engineer and competitive programmer. Provide clear, efficient, and well-commented solutions to coding problems."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,  # Lower temperature for more consistent code generation
-                max_tokens=2000,
-                top_p=1,
-                stream=False
-            )
+            body = _BODY_PREFIX + json.dumps(prompt).encode("utf-8") + _BODY_SUFFIX
+            response = self.client.post(GROQ_CHAT_URL, content=body)
+            response.raise_for_status()
 
-            if not response.choices:
+            choices = json_loads(response.content).get("choices")
+            if not choices:
                 logger.error("No response from Groq API")
                 return None
 
-            content = response.choices[0].message.content
+            content = choices[0]["message"]["content"]
 
             # Parse the response to extract different sections
             solution_data = self._parse_solution_response(content, language)
@@ -199,6 +273,10 @@ APPROACH:
                 humor_comments="",  # Will be filled by HumorAgent
             )
 
+            if problem.id is not None:
+                with self._cache_lock:
+                    self._solution_cache[cache_key] = replace(solution)
+
             logger.info(f"Successfully generated solution for '{problem.title}' in {language}")
             return solution
 
@@ -226,52 +304,23 @@ APPROACH:
         }
 
         try:
-            lines = content.split('\n')
             current_section = None
             current_content = []
 
-            for line in lines:
-                line_lower = line.lower().strip()
-
+            for line in content.split('\n'):
                 # Detect section headers
-                if line_lower.startswith('solution:'):
-                    current_section = "code"
-                    current_content = []
-                elif line_lower.startswith('explanation:'):
-                    if current_section == "code":
-                        result["code"] = self._extract_code_block('\n'.join(current_content), language)
-                    current_section = "explanation"
-                    current_content = []
-                elif line_lower.startswith('time complexity:'):
-                    if current_section == "explanation":
-                        result["explanation"] = '\n'.join(current_content).strip()
-                    current_section = "time_complexity"
-                    current_content = []
-                elif line_lower.startswith('space complexity:'):
-                    if current_section == "time_complexity":
-                        result["time_complexity"] = '\n'.join(current_content).strip()
-                    current_section = "space_complexity"
-                    current_content = []
-                elif line_lower.startswith('approach:'):
-                    if current_section == "space_complexity":
-                        result["space_complexity"] = '\n'.join(current_content).strip()
-                    current_section = "approach"
-                    current_content = []
-                else:
+                match = _SECTION_HEADER_RE.match(line)
+                if match:
                     if current_section:
-                        current_content.append(line)
+                        self._store_section(result, current_section, current_content, language)
+                    current_section = _SECTION_KEYS[match.group(1).lower()]
+                    current_content = []
+                elif current_section:
+                    current_content.append(line)
 
             # Handle the last section
-            if current_section == "code":
-                result["code"] = self._extract_code_block('\n'.join(current_content), language)
-            elif current_section == "explanation":
-                result["explanation"] = '\n'.join(current_content).strip()
-            elif current_section == "time_complexity":
-                result["time_complexity"] = '\n'.join(current_content).strip()
-            elif current_section == "space_complexity":
-                result["space_complexity"] = '\n'.join(current_content).strip()
-            elif current_section == "approach":
-                result["approach"] = '\n'.join(current_content).strip()
+            if current_section:
+                self._store_section(result, current_section, current_content, language)
 
             # If parsing failed, try to extract code block from anywhere in the content
             if not result["code"]:
@@ -289,6 +338,23 @@ APPROACH:
 
         return result
 
+    def _store_section(self, result: Dict[str, str], section: str,
+                       lines: list, language: str) -> None:
+        """
+        Join the collected lines of a section and store them in the result.
+
+        Args:
+            result: Dictionary with parsed sections
+            section: Key of the section being stored
+            lines: Lines collected for the section
+            language: Programming language used
+        """
+        text = '\n'.join(lines)
+        if section == "code":
+            result["code"] = self._extract_code_block(text, language)
+        else:
+            result[section] = text.strip()
+
     def _extract_code_block(self, content: str, language: str) -> str:
         """
         Extract code block from markdown-style code fences.
@@ -301,9 +367,6 @@ APPROACH:
             Extracted code string
         """
         try:
-            # Look for code blocks with language specification
-            import re
-
             # Pattern for code blocks: ```language\ncode\n```
             pattern = rf'```{language}\s*\n(.*?)\n```'
             match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
@@ -337,18 +400,19 @@ APPROACH:
 
         try:
             # Simple test request
-            response = self.client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[
+            response = self.client.post(GROQ_CHAT_URL, json={
+                "model": GROQ_MODEL,
+                "messages": [
                     {
                         "role": "user",
                         "content": "Hello, please respond with 'Connection successful'"
                     }
                 ],
-                max_tokens=10
-            )
+                "max_tokens": 10
+            })
+            response.raise_for_status()
 
-            return bool(response.choices)
+            return bool(response.json().get("choices"))
 
         except Exception as e:
             logger.error(f"Groq API connection test failed: {e}")
@@ -362,3 +426,13 @@ APPROACH:
             List of supported language strings
         """
         return list(Config.SUPPORTED_LANGUAGES.keys())
+
+    def close(self):
+        """Close the pooled HTTP client."""
+        if self.client:
+            try:
+                self.client.close()
+                logger.info("SolveAgent HTTP client closed")
+            except Exception as e:
+                logger.warning(f"Error closing SolveAgent HTTP client: {e}")
+            self.client = None
@@ -31,6 +31,9 @@ class Config:
     SCHEDULER_MINUTE: int = int(os.getenv("SCHEDULER_MINUTE", "0"))
     SCHEDULER_TIMEZONE: str = os.getenv("SCHEDULER_TIMEZONE", "UTC")
 
+    # Number of users processed concurrently during the daily email run
+    EMAIL_WORKERS: int = int(os.getenv("EMAIL_WORKERS", "8"))
+
     # Application Configuration
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
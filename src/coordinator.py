@@ -4,8 +4,16 @@ This module orchestrates all agents and handles the main business logic.
 """
 
 import logging
-from typing import Optional, List, Dict, Any
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from itertools import islice
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
+from cachetools import TTLCache, cachedmethod
 
 try:
     from .database import DatabaseManager, User, Problem, Solution
@@ -20,6 +28,50 @@ except ImportError:
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# Minimal email shape check: something@domain.tld without whitespace
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Valid preference values, resolved once for the validation paths
+_LANGS = frozenset(k.lower() for k in Config.SUPPORTED_LANGUAGES)
+_DIFFS = frozenset(k.lower() for k in Config.DIFFICULTY_LEVELS)
+
+# Number of active users loaded and processed together during the daily run
+USER_BATCH_SIZE = 500
+
+# How long get_system_stats results are reused before querying again
+STATS_CACHE_TTL_SECONDS = 30
+
+# How long test_system_health results are reused, so frequent health polls
+# don't hit the rate-limited Groq and SMTP services every time
+HEALTH_CACHE_TTL_SECONDS = 10
+
+# How many times a batch of sent-problem rows is written before the failure
+# is reported in the run results, and the pause between attempts
+WRITE_ATTEMPTS = 3
+WRITE_RETRY_DELAY_SECONDS = 0.5
+
+def _agent_property(factory):
+    """
+    Lazily create an agent on first access, like functools.cached_property,
+    but under the coordinator's _agents_lock so concurrent first accesses from
+    worker threads share a single instance.
+    """
+    name = factory.__name__
+
+    def getter(self):
+        agent = self._agents.get(name)
+        if agent is None:
+            with self._agents_lock:
+                agent = self._agents.get(name)
+                if agent is None:
+                    agent = self._agents[name] = factory(self)
+        return agent
+
+    def setter(self, agent):
+        self._agents[name] = agent
+
+    return property(getter, setter, doc=factory.__doc__)
+
 class LeetcodeEmailCoordinator:
     """
     Central coordinator that manages all agents and orchestrates the daily email process.
@@ -27,23 +79,51 @@ class LeetcodeEmailCoordinator:
     """
 
     def __init__(self):
-        """Initialize the coordinator with all agents and database manager."""
+        """
+        Initialize the coordinator with the database manager.
+        Agents are created on first use, so commands that only manage users
+        don't pay for the Groq client or the fetch agent.
+        """
         try:
             # Initialize database manager
             self.db_manager = DatabaseManager()
 
-            # Initialize all agents
-            self.fetch_agent = FetchAgent()
-            self.solve_agent = SolveAgent()
-            self.humor_agent = HumorAgent()
-            self.mail_agent = MailAgent()
+            # Agents created so far by the _agent_property accessors
+            self._agents: Dict[str, Any] = {}
+            self._agents_lock = threading.Lock()
+
+            # Short-lived cache so bursts of stats requests hit the database once
+            self._stats_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL_SECONDS)
+            self._stats_lock = threading.Lock()
+            self._health_cache = TTLCache(maxsize=1, ttl=HEALTH_CACHE_TTL_SECONDS)
+            self._health_lock = threading.Lock()
 
             logger.info("LeetcodeEmailCoordinator initialized successfully")
 
         except Exception as e:
-            logger.error(f"Failed to initialize LeetcodeEmailCoordinator: {e}")
+            logger.error("Failed to initialize LeetcodeEmailCoordinator: %s", e)
             raise
 
+    @_agent_property
+    def fetch_agent(self) -> FetchAgent:
+        """Agent that provides problems from the data source."""
+        return FetchAgent()
+
+    @_agent_property
+    def solve_agent(self) -> SolveAgent:
+        """Agent that generates solutions with the Groq API."""
+        return SolveAgent()
+
+    @_agent_property
+    def humor_agent(self) -> HumorAgent:
+        """Agent that adds humor to generated solutions."""
+        return HumorAgent()
+
+    @_agent_property
+    def mail_agent(self) -> MailAgent:
+        """Agent that sends emails over SMTP."""
+        return MailAgent()
+
     def process_daily_emails(self) -> Dict[str, Any]:
         """
         Process and send daily emails to all active users.
@@ -53,6 +133,7 @@ class LeetcodeEmailCoordinator:
             Dictionary with processing results and statistics
         """
         logger.info("Starting daily email processing")
+        start = time.perf_counter()
 
         results = {
             "total_users": 0,
@@ -64,27 +145,80 @@ class LeetcodeEmailCoordinator:
         }
 
         try:
-            # Get all active users
-            active_users = self.db_manager.get_active_users()
-            results["total_users"] = len(active_users)
+            # Stream active users in batches so the first emails go out after the
+            # first batch is read, and memory stays flat as the user base grows
+            users = self.db_manager.iter_active_users(batch_size=USER_BATCH_SIZE)
+
+            while batch := list(islice(users, USER_BATCH_SIZE)):
+                results["total_users"] += len(batch)
+                logger.info("Processing emails for a batch of %s active users", len(batch))
+                self._process_user_batch(batch, results)
 
-            if not active_users:
+            if not results["total_users"]:
                 logger.info("No active users found")
-                results["end_time"] = datetime.now()
-                return results
 
-            logger.info(f"Processing emails for {len(active_users)} active users")
+            results["end_time"] = datetime.now()
+            duration = time.perf_counter() - start
+
+            logger.info("Daily email processing completed in %.2f seconds", duration)
+            logger.info("Results: %s sent, %s failed",
+                        results['emails_sent'], results['emails_failed'])
+
+            return results
+
+        except Exception as e:
+            error_msg = f"Critical error in daily email processing: {e}"
+            logger.error(error_msg)
+            results["errors"].append(error_msg)
+            results["end_time"] = datetime.now()
+            return results
+
+    def _process_user_batch(self, users: List[User], results: Dict[str, Any]):
+        """
+        Process emails for a batch of users, tallying outcomes into results.
 
-            # Process each user
-            for user in active_users:
+        Args:
+            users: Active users to process
+            results: Results dictionary of the current daily run
+        """
+        # Pick every user's next problem in one query instead of one per user
+        unsent_problems = self.db_manager.get_unsent_problems_for_users(users)
+
+        # Users who have seen every stored problem get new ones fetched in bulk
+        exhausted_users = [user for user in users if user.id not in unsent_problems]
+        if exhausted_users:
+            unsent_problems.update(self._refill_problems(exhausted_users, results))
+
+        # Generate each distinct (problem, language) solution once, concurrently,
+        # before any email goes out
+        solutions = self._generate_solutions(users, unsent_problems)
+
+        # Sent-problem rows collected by the workers and written once per batch.
+        # Workers append without a lock, relying on list.append being atomic
+        # (the GIL, or the per-list lock on free-threaded builds).
+        sent_rows: List[Tuple[int, int, str, str]] = []
+
+        # Process users concurrently; each one is dominated by LLM and SMTP latency.
+        # Results are tallied here in the main thread as the futures complete.
+        with ThreadPoolExecutor(max_workers=max(1, Config.EMAIL_WORKERS)) as executor:
+            futures = {}
+            for user in users:
+                problem = unsent_problems.get(user.id)
+                solution = solutions.get(self._solution_key(user, problem))
+                future = executor.submit(self._process_user_email, user, problem,
+                                         solution, sent_rows)
+                futures[future] = user
+
+            for future in as_completed(futures):
+                user = futures[future]
                 try:
-                    success = self._process_user_email(user)
+                    success = future.result()
                     if success:
                         results["emails_sent"] += 1
-                        logger.info(f"Successfully processed email for {user.email}")
+                        logger.info("Successfully processed email for %s", user.email)
                     else:
                         results["emails_failed"] += 1
-                        logger.warning(f"Failed to process email for {user.email}")
+                        logger.warning("Failed to process email for %s", user.email)
 
                 except Exception as e:
                     results["emails_failed"] += 1
@@ -92,55 +226,115 @@ class LeetcodeEmailCoordinator:
                     results["errors"].append(error_msg)
                     logger.error(error_msg)
 
-            results["end_time"] = datetime.now()
-            duration = (results["end_time"] - results["start_time"]).total_seconds()
+        # Record the batch before returning, so a run started right after this
+        # one never picks a problem these users were just sent
+        self._record_sent(sent_rows, results)
 
-            logger.info(f"Daily email processing completed in {duration:.2f} seconds")
-            logger.info(f"Results: {results['emails_sent']} sent, {results['emails_failed']} failed")
+    @staticmethod
+    def _solution_key(user: User, problem: Optional[Problem]) -> Optional[Tuple[int, str]]:
+        """Key identifying the solution a user needs for a problem."""
+        if not problem:
+            return None
+        return problem.id, user.preferred_language.lower()
 
-            return results
+    def _generate_solutions(self, users: List[User],
+                            problems: Dict[int, Problem]) -> Dict[Tuple[int, str], Solution]:
+        """
+        Generate the solutions needed by a batch of users concurrently.
+        Users sharing a problem and language share a single LLM call.
 
-        except Exception as e:
-            error_msg = f"Critical error in daily email processing: {e}"
-            logger.error(error_msg)
-            results["errors"].append(error_msg)
-            results["end_time"] = datetime.now()
-            return results
+        Args:
+            users: Users being processed
+            problems: Pre-fetched unsent problem for each user ID
+
+        Returns:
+            Dictionary mapping (problem ID, language) to the generated Solution
+        """
+        wanted = {}
+        for user in users:
+            problem = problems.get(user.id)
+            if problem:
+                wanted[self._solution_key(user, problem)] = problem
+
+        if not wanted:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max(1, Config.EMAIL_WORKERS)) as executor:
+            generated = executor.map(
+                lambda key: self.solve_agent.generate_solution(wanted[key], key[1]),
+                wanted
+            )
+            solutions = dict(zip(wanted, generated))
+
+        return {key: solution for key, solution in solutions.items() if solution}
 
-    def _process_user_email(self, user: User) -> bool:
+    def _record_sent(self, rows: List[Tuple[int, int, str, str]], results: Dict[str, Any]):
+        """
+        Write a batch's sent-problem rows, retrying transient failures.
+        Rows that still can't be written are reported in results["errors"].
+
+        Args:
+            rows: (user_id, problem_id, solution_language, email_status) tuples
+            results: Results dictionary of the current daily run
+        """
+        if not rows:
+            return
+
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            if self.db_manager.mark_problems_sent_bulk(rows):
+                return
+            logger.warning("Attempt %s/%s to record %s sent problems failed",
+                           attempt, WRITE_ATTEMPTS, len(rows))
+            if attempt < WRITE_ATTEMPTS:
+                time.sleep(WRITE_RETRY_DELAY_SECONDS)
+
+        error_msg = (f"Failed to record {len(rows)} sent problems for users "
+                     f"{sorted({row[0] for row in rows})}")
+        logger.error(error_msg)
+        results["errors"].append(error_msg)
+
+    def shutdown(self):
+        """Close the Groq HTTP client, if the solve agent was created, and the database connections."""
+        solve_agent = self._agents.get("solve_agent")
+        if solve_agent is not None:
+            solve_agent.close()
+        self.db_manager.close()
+        logger.info("LeetcodeEmailCoordinator shut down")
+
+    def _process_user_email(self, user: User, problem: Optional[Problem] = None,
+                            solution: Optional[Solution] = None,
+                            sent_rows: Optional[List[Tuple[int, int, str, str]]] = None) -> bool:
         """
         Process email for a single user.
 
         Args:
             user: User object to process
+            problem: Unsent problem pre-fetched for the user, or None if there was none
+            solution: Pre-generated solution for the problem, generated here if None
+            sent_rows: Collects the sent-problem row for the caller to write;
+                if None, the row is written to the database immediately
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Processing email for user: {user.email}")
-
-            # Step 1: Get an unsent problem for the user
-            problem = self.db_manager.get_unsent_problem_for_user(
-                user.id, user.preferred_difficulty
-            )
+            logger.info("Processing email for user: %s", user.email)
 
+            # Step 1: Use the pre-fetched unsent problem for the user
             if not problem:
-                logger.warning(f"No unsent problems available for user {user.email} "
-                             f"with difficulty {user.preferred_difficulty}")
-
-                # Try to get a problem from the fetch agent and add it to database
-                problem = self._get_and_store_new_problem(user.preferred_difficulty)
-
-                if not problem:
-                    logger.error(f"Could not get any problem for user {user.email}")
-                    return False
+                logger.error("Could not get any problem for user %s with difficulty %s",
+                             user.email, user.preferred_difficulty)
+                return False
 
-            # Step 2: Generate solution using SolveAgent
-            solution = self.solve_agent.generate_solution(problem, user.preferred_language)
+            # Step 2: Generate solution using SolveAgent, unless it was pre-generated.
+            # Pre-generated solutions are shared between users, so work on a copy.
+            if solution:
+                solution = replace(solution)
+            else:
+                solution = self.solve_agent.generate_solution(problem, user.preferred_language)
 
             if not solution:
-                logger.error(f"Failed to generate solution for problem '{problem.title}'")
+                logger.error("Failed to generate solution for problem '%s'", problem.title)
                 return False
 
             # Step 3: Add humor to the solution
@@ -149,62 +343,75 @@ class LeetcodeEmailCoordinator:
             # Step 4: Send email
             email_sent = self.mail_agent.send_daily_problem(user, problem, enhanced_solution)
 
+            # Step 5: Mark the problem as sent (or failed) in database
+            status = "sent" if email_sent else "failed"
+            row = (user.id, problem.id, user.preferred_language, status)
+            if sent_rows is not None:
+                sent_rows.append(row)
+            else:
+                self.db_manager.mark_problems_sent_bulk([row])
+
             if email_sent:
-                # Step 5: Mark problem as sent in database
-                self.db_manager.mark_problem_sent(
-                    user.id,
-                    problem.id,
-                    user.preferred_language,
-                    "sent"
-                )
-                logger.info(f"Successfully sent problem '{problem.title}' to {user.email}")
+                logger.info("Successfully sent problem '%s' to %s", problem.title, user.email)
                 return True
             else:
-                # Mark as failed in database
-                self.db_manager.mark_problem_sent(
-                    user.id,
-                    problem.id,
-                    user.preferred_language,
-                    "failed"
-                )
-                logger.error(f"Failed to send email to {user.email}")
+                logger.error("Failed to send email to %s", user.email)
                 return False
 
         except Exception as e:
-            logger.error(f"Error processing email for user {user.email}: {e}")
+            logger.error("Error processing email for user %s: %s", user.email, e)
             return False
 
-    def _get_and_store_new_problem(self, difficulty: str) -> Optional[Problem]:
+    def _refill_problems(self, users: List[User], results: Dict[str, Any]) -> Dict[int, Problem]:
         """
-        Get a new problem from fetch agent and store it in database.
+        Fetch and store new problems for users with no unsent problems left.
+        Problems are fetched once per difficulty, skipping titles that are
+        already stored (every stored problem of that difficulty has been sent
+        to these users), sized to the number of users needing that difficulty,
+        and stored with a single bulk insert.
 
         Args:
-            difficulty: Difficulty level to fetch
+            users: Users that have no unsent problem of their preferred difficulty
+            results: Results dictionary of the current daily run; difficulties
+                with no new problems left are reported in its errors
 
         Returns:
-            Problem object if successful, None otherwise
+            Dictionary mapping user ID to a newly available Problem
         """
         try:
-            # Get problem from fetch agent
-            problem = self.fetch_agent.get_problem_by_difficulty(difficulty)
+            needed = Counter(user.preferred_difficulty for user in users)
+            for difficulty, count in needed.items():
+                logger.warning("No unsent problems available for %s users with difficulty %s",
+                               count, difficulty)
 
-            if not problem:
-                logger.warning(f"FetchAgent could not provide problem for difficulty: {difficulty}")
-                return None
+            stored_titles = self.db_manager.get_problem_titles()
 
-            # Store in database
-            stored_problem = self.db_manager.add_problem(problem)
+            new_problems = []
+            for difficulty, count in needed.items():
+                problems = self.fetch_agent.get_problems_by_difficulty(
+                    difficulty, count=count, exclude_titles=stored_titles
+                )
+                if not problems:
+                    error_msg = (f"No problems left for {count} users with difficulty "
+                                 f"{difficulty}: every available problem has been sent")
+                    logger.error(error_msg)
+                    results["errors"].append(error_msg)
+                new_problems.extend(problems)
 
-            if stored_problem:
-                logger.info(f"Added new problem to database: {stored_problem.title}")
-                return stored_problem
-            else:
-                logger.error(f"Failed to store problem in database: {problem.title}")
-                return None
+            if not new_problems:
+                return {}
+
+            added_count = self.db_manager.add_problems_bulk(new_problems)
+            logger.info("Added %s new problems to database", added_count)
+
+            if not added_count:
+                return {}
+
+            return self.db_manager.get_unsent_problems_for_users(users)
 
         except Exception as e:
-            logger.error(f"Error getting and storing new problem: {e}")
-            return None
+            logger.error("Error refilling problems for %s users: %s", len(users), e)
+            return {}
 
     def add_user(self, email: str, preferred_language: str = "python",
                  preferred_difficulty: str = "medium") -> bool:
@@ -221,39 +428,35 @@ class LeetcodeEmailCoordinator:
         """
         try:
             # Validate inputs
-            if not email or "@" not in email:
-                logger.error(f"Invalid email address: {email}")
+            if not email or not _EMAIL_RE.match(email):
+                logger.error("Invalid email address: %s", email)
                 return False
 
-            if preferred_language.lower() not in Config.SUPPORTED_LANGUAGES:
-                logger.error(f"Unsupported language: {preferred_language}")
+            if preferred_language.lower() not in _LANGS:
+                logger.error("Unsupported language: %s", preferred_language)
                 return False
 
-            if preferred_difficulty.lower() not in Config.DIFFICULTY_LEVELS:
-                logger.error(f"Unsupported difficulty: {preferred_difficulty}")
+            if preferred_difficulty.lower() not in _DIFFS:
+                logger.error("Unsupported difficulty: %s", preferred_difficulty)
                 return False
 
             # Check if user already exists
             existing_user = self.db_manager.get_user_by_email(email)
             if existing_user:
                 if existing_user.is_active:
-                    logger.warning(f"User {email} is already subscribed")
+                    logger.warning("User %s is already subscribed", email)
                     return False
                 else:
                     # Reactivate user with new preferences
-                    success = self.db_manager.update_user_preferences(
+                    user = self.db_manager.reactivate_user(
                         email, preferred_language, preferred_difficulty
                     )
-                    if success:
-                        # Reactivate user
-                        self.db_manager.deactivate_user(email)  # This sets is_active to False
-                        # We need to manually reactivate - let's update the method call
-                        logger.info(f"Reactivated user: {email}")
+                    if user:
+                        logger.info("Reactivated user: %s", email)
+                        self.invalidate_stats()
 
                         # Send welcome email
-                        user = self.db_manager.get_user_by_email(email)
-                        if user:
-                            self.mail_agent.send_welcome_email(user)
+                        self.mail_agent.send_welcome_email(user)
                         return True
                     return False
 
@@ -261,22 +464,23 @@ class LeetcodeEmailCoordinator:
             user = self.db_manager.add_user(email, preferred_language, preferred_difficulty)
 
             if user:
-                logger.info(f"Successfully added new user: {email}")
+                logger.info("Successfully added new user: %s", email)
+                self.invalidate_stats()
 
                 # Send welcome email
                 welcome_sent = self.mail_agent.send_welcome_email(user)
                 if welcome_sent:
-                    logger.info(f"Welcome email sent to {email}")
+                    logger.info("Welcome email sent to %s", email)
                 else:
-                    logger.warning(f"Failed to send welcome email to {email}")
+                    logger.warning("Failed to send welcome email to %s", email)
 
                 return True
             else:
-                logger.error(f"Failed to add user: {email}")
+                logger.error("Failed to add user: %s", email)
                 return False
 
         except Exception as e:
-            logger.error(f"Error adding user {email}: {e}")
+            logger.error("Error adding user %s: %s", email, e)
             return False
 
     def remove_user(self, email: str) -> bool:
@@ -293,33 +497,34 @@ class LeetcodeEmailCoordinator:
             # Check if user exists
             user = self.db_manager.get_user_by_email(email)
             if not user:
-                logger.warning(f"User not found: {email}")
+                logger.warning("User not found: %s", email)
                 return False
 
             if not user.is_active:
-                logger.warning(f"User {email} is already inactive")
+                logger.warning("User %s is already inactive", email)
                 return True
 
             # Deactivate user
             success = self.db_manager.deactivate_user(email)
 
             if success:
-                logger.info(f"Successfully deactivated user: {email}")
+                logger.info("Successfully deactivated user: %s", email)
+                self.invalidate_stats()
 
                 # Send unsubscribe confirmation
                 confirmation_sent = self.mail_agent.send_unsubscribe_confirmation(email)
                 if confirmation_sent:
-                    logger.info(f"Unsubscribe confirmation sent to {email}")
+                    logger.info("Unsubscribe confirmation sent to %s", email)
                 else:
-                    logger.warning(f"Failed to send unsubscribe confirmation to {email}")
+                    logger.warning("Failed to send unsubscribe confirmation to %s", email)
 
                 return True
             else:
-                logger.error(f"Failed to deactivate user: {email}")
+                logger.error("Failed to deactivate user: %s", email)
                 return False
 
         except Exception as e:
-            logger.error(f"Error removing user {email}: {e}")
+            logger.error("Error removing user %s: %s", email, e)
             return False
 
     def update_user_preferences(self, email: str, preferred_language: str = None,
@@ -337,18 +542,18 @@ class LeetcodeEmailCoordinator:
         """
         try:
             # Validate inputs
-            if preferred_language and preferred_language.lower() not in Config.SUPPORTED_LANGUAGES:
-                logger.error(f"Unsupported language: {preferred_language}")
+            if preferred_language and preferred_language.lower() not in _LANGS:
+                logger.error("Unsupported language: %s", preferred_language)
                 return False
 
-            if preferred_difficulty and preferred_difficulty.lower() not in Config.DIFFICULTY_LEVELS:
-                logger.error(f"Unsupported difficulty: {preferred_difficulty}")
+            if preferred_difficulty and preferred_difficulty.lower() not in _DIFFS:
+                logger.error("Unsupported difficulty: %s", preferred_difficulty)
                 return False
 
             # Check if user exists
             user = self.db_manager.get_user_by_email(email)
             if not user:
-                logger.warning(f"User not found: {email}")
+                logger.warning("User not found: %s", email)
                 return False
 
             # Update preferences
@@ -357,14 +562,14 @@ class LeetcodeEmailCoordinator:
             )
 
             if success:
-                logger.info(f"Successfully updated preferences for user: {email}")
+                logger.info("Successfully updated preferences for user: %s", email)
                 return True
             else:
-                logger.error(f"Failed to update preferences for user: {email}")
+                logger.error("Failed to update preferences for user: %s", email)
                 return False
 
         except Exception as e:
-            logger.error(f"Error updating preferences for user {email}: {e}")
+            logger.error("Error updating preferences for user %s: %s", email, e)
             return False
 
     def get_user_stats(self, email: str) -> Optional[Dict[str, Any]]:
@@ -378,12 +583,12 @@ class LeetcodeEmailCoordinator:
             Dictionary with user statistics or None if user not found
         """
         try:
-            user = self.db_manager.get_user_by_email(email)
-            if not user:
-                logger.warning(f"User not found: {email}")
+            user_with_stats = self.db_manager.get_user_with_stats(email)
+            if not user_with_stats:
+                logger.warning("User not found: %s", email)
                 return None
 
-            stats = self.db_manager.get_user_stats(user.id)
+            user, stats = user_with_stats
             stats.update({
                 "email": user.email,
                 "preferred_language": user.preferred_language,
@@ -395,75 +600,91 @@ class LeetcodeEmailCoordinator:
             return stats
 
         except Exception as e:
-            logger.error(f"Error getting stats for user {email}: {e}")
+            logger.error("Error getting stats for user %s: %s", email, e)
             return None
 
     def get_system_stats(self) -> Dict[str, Any]:
         """
         Get overall system statistics.
+        Results are cached for STATS_CACHE_TTL_SECONDS.
 
         Returns:
             Dictionary with system statistics
         """
         try:
-            active_users = self.db_manager.get_active_users()
-            problem_stats = self.fetch_agent.get_stats()
-
-            stats = {
-                "total_active_users": len(active_users),
-                "total_problems": problem_stats.get("total", 0),
-                "problems_by_difficulty": problem_stats.get("by_difficulty", {}),
-                "supported_languages": list(Config.SUPPORTED_LANGUAGES.keys()),
-                "supported_difficulties": list(Config.DIFFICULTY_LEVELS.keys()),
-                "timestamp": datetime.now().isoformat()
-            }
-
-            return stats
+            return self._compute_system_stats()
 
         except Exception as e:
-            logger.error(f"Error getting system stats: {e}")
+            logger.error("Error getting system stats: %s", e)
             return {}
 
+    def invalidate_stats(self):
+        """Drop the cached system statistics, e.g. after a user is added or removed."""
+        with self._stats_lock:
+            self._stats_cache.clear()
+
+    @cachedmethod(lambda self: self._stats_cache, lock=lambda self: self._stats_lock)
+    def _compute_system_stats(self) -> Dict[str, Any]:
+        """Query the system statistics; errors propagate so they are never cached."""
+        active_users = self.db_manager.get_active_users()
+        problem_stats = self.fetch_agent.get_stats()
+
+        return {
+            "total_active_users": len(active_users),
+            "total_problems": problem_stats.get("total", 0),
+            "problems_by_difficulty": problem_stats.get("by_difficulty", {}),
+            "supported_languages": list(Config.SUPPORTED_LANGUAGES.keys()),
+            "supported_difficulties": list(Config.DIFFICULTY_LEVELS.keys()),
+            "timestamp": datetime.now().isoformat()
+        }
+
     def test_system_health(self) -> Dict[str, bool]:
         """
         Test the health of all system components.
+        The probes are independent and I/O bound, so they run concurrently.
+        Results are cached for HEALTH_CACHE_TTL_SECONDS.
 
         Returns:
-            Dictionary with health status of each component
+            Dictionary with health status of each component; a copy, so
+            callers can modify it without affecting the cached result
         """
-        health = {}
+        return dict(self._check_health())
 
-        try:
+    @cachedmethod(lambda self: self._health_cache, lock=lambda self: self._health_lock)
+    def _check_health(self) -> Dict[str, bool]:
+        """Run the health probes; the result is shared by all callers within the TTL."""
+        checks = {
             # Test database
-            health["database"] = bool(self.db_manager.get_active_users() is not None)
-        except Exception as e:
-            logger.error(f"Database health check failed: {e}")
-            health["database"] = False
-
-        try:
+            "database": lambda: self.db_manager.ping(),
             # Test Groq API
-            health["groq_api"] = self.solve_agent.test_connection()
-        except Exception as e:
-            logger.error(f"Groq API health check failed: {e}")
-            health["groq_api"] = False
-
-        try:
+            "groq_api": lambda: self.solve_agent.test_connection(),
             # Test email
-            health["email"] = self.mail_agent.test_connection()
-        except Exception as e:
-            logger.error(f"Email health check failed: {e}")
-            health["email"] = False
-
-        try:
+            "email": lambda: self.mail_agent.test_connection(),
             # Test fetch agent
-            health["fetch_agent"] = bool(self.fetch_agent.get_stats()["total"] > 0)
-        except Exception as e:
-            logger.error(f"Fetch agent health check failed: {e}")
-            health["fetch_agent"] = False
+            "fetch_agent": lambda: self.fetch_agent.has_problems()
+        }
+        labels = {
+            "database": "Database",
+            "groq_api": "Groq API",
+            "email": "Email",
+            "fetch_agent": "Fetch agent"
+        }
+
+        health = {}
+
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {name: executor.submit(check) for name, check in checks.items()}
+
+            for name, future in futures.items():
+                try:
+                    health[name] = bool(future.result())
+                except Exception as e:
+                    logger.error("%s health check failed: %s", labels[name], e)
+                    health[name] = False
 
         health["overall"] = all(health.values())
 
-        logger.info(f"System health check completed: {health}")
+        logger.info("System health check completed: %s", health)
         return health
 
     def initialize_sample_data(self) -> bool:
@@ -484,15 +705,11 @@ class LeetcodeEmailCoordinator:
                 logger.warning("No problems available from fetch agent")
                 return False
 
-            added_count = 0
-            for problem in problems:
-                stored_problem = self.db_manager.add_problem(problem)
-                if stored_problem:
-                    added_count += 1
+            added_count = self.db_manager.add_problems_bulk(problems)
 
-            logger.info(f"Successfully added {added_count} problems to database")
+            logger.info("Successfully added %s problems to database", added_count)
             return added_count > 0
 
         except Exception as e:
-            logger.error(f"Error initializing sample data: {e}")
+            logger.error("Error initializing sample data: %s", e)
             return False
@@ -5,10 +5,16 @@ This file handles all database operations using SQLite.
 
 import sqlite3
 import os
+import queue
+import random
+import threading
+from contextlib import contextmanager
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Generator, Set
 import json
 import logging
+from cachetools import TTLCache
 
 try:
     from .models import User, Problem, SentProblem, Solution
@@ -21,6 +27,54 @@ except ImportError:
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# INSERT/UPDATE ... RETURNING needs SQLite 3.35 or newer, and the JSON
+# functions used for per-user stats are built in from 3.38
+MIN_SQLITE_VERSION = (3, 38, 0)
+
+# Maximum number of SQLite connections kept open by a DatabaseManager
+CONNECTION_POOL_SIZE = 4
+
+# Prepared statements kept per connection by the sqlite3 module, so the
+# repeated queries below are parsed and planned once per connection
+STATEMENT_CACHE_SIZE = 256
+
+# Applied once to every new pooled connection, including the one that runs
+# _initialize_database. WAL lets readers proceed during writes and, with
+# synchronous=NORMAL, only fsyncs at checkpoints. The WAL and shared-memory
+# files live next to the database file.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",   # 256 MiB memory-mapped I/O
+    "PRAGMA cache_size=-65536",     # 64 MiB page cache
+)
+
+def _convert_timestamp(value: bytes) -> datetime:
+    """Parse a TIMESTAMP column value ("YYYY-MM-DD HH:MM:SS") into a datetime."""
+    return datetime.fromisoformat(value.decode())
+
+# Columns declared TIMESTAMP come back from connections opened with
+# PARSE_DECLTYPES as datetimes, converted inside the sqlite3 fetch loop
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+
+# Number of user lookups (by email and by ID) kept in memory, and how long
+# each is trusted. The UI, scheduler and CLI run as separate processes with
+# their own caches, so entries expire quickly to pick up each other's writes.
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL_SECONDS = 5
+
+# Columns added to the users table after its first release, with their
+# definitions; older databases get them via ALTER TABLE at startup
+_USER_MIGRATION_COLUMNS = {
+    "solution_delivery": "TEXT DEFAULT 'with_problem'",
+    "solution_delay_hours": "INTEGER DEFAULT 24",
+    "preferred_time": "TEXT DEFAULT '09:00'",
+    "timezone": "TEXT DEFAULT 'UTC'",
+    "total_sent": "INTEGER DEFAULT 0",
+    "by_difficulty_json": "TEXT DEFAULT '{}'",
+}
+
 class DatabaseManager:
     """
     Manages all database operations for the Leetcode Email Agent.
@@ -34,8 +88,32 @@ class DatabaseManager:
         Args:
             db_path: Path to the SQLite database file
         """
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer is required, "
+                f"found {sqlite3.sqlite_version}"
+            )
+
         self.db_path = db_path or Config.DATABASE_PATH
         self._ensure_database_directory()
+
+        # Small pool of long-lived connections, opened lazily up to
+        # CONNECTION_POOL_SIZE. With WAL, readers run concurrently on their own
+        # connections while writes are serialized by _write_lock.
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=CONNECTION_POOL_SIZE)
+        self._pool_lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._write_lock = threading.Lock()
+
+        # get_user_by_email/get_user_by_id results keyed by ("email", email) and
+        # ("id", user_id); entries are dropped whenever the user is written here.
+        # Misses aren't cached, so a user added by another process is seen at once.
+        self._user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+        self._user_cache_lock = threading.Lock()
+        # Bumped on every invalidation so a lookup that raced with a write
+        # doesn't cache the row it read before the write committed
+        self._user_cache_generation = 0
+
         self._initialize_database()
 
     def _ensure_database_directory(self):
@@ -43,22 +121,135 @@ class DatabaseManager:
         db_dir = os.path.dirname(self.db_path)
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
-            logger.info(f"Created database directory: {db_dir}")
+            logger.info("Created database directory: %s", db_dir)
 
-    def _get_connection(self) -> sqlite3.Connection:
+    def _connect(self) -> sqlite3.Connection:
         """
-        Get a database connection with proper configuration.
+        Open a new connection in autocommit mode (transactions are started
+        explicitly by _transaction) and apply the per-connection PRAGMAs.
 
         Returns:
             SQLite connection object
         """
-        conn = sqlite3.Connection(self.db_path)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                               cached_statements=STATEMENT_CACHE_SIZE,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
         conn.row_factory = sqlite3.Row  # This allows us to access columns by name
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
+    @contextmanager
+    def _borrow(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Borrow a connection from the pool, opening a new one if the pool is
+        empty and not yet full, and return it to the pool afterwards.
+        Connections are in autocommit mode, so reads made on a borrowed
+        connection run without a BEGIN/COMMIT pair; writers use _transaction.
+
+        Yields:
+            SQLite connection object
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                conn = None
+                if len(self._connections) < CONNECTION_POOL_SIZE:
+                    conn = self._connect()
+                    self._connections.append(conn)
+            if conn is None:
+                conn = self._pool.get()
+
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Borrow a pooled connection inside a write transaction that is committed on
+        success and rolled back if the block raises.
+
+        Yields:
+            SQLite connection object
+        """
+        with self._write_lock, self._borrow() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def ping(self) -> bool:
+        """
+        Check that the database answers a trivial query.
+
+        Returns:
+            True if the database is reachable, False otherwise
+        """
+        try:
+            with self._borrow() as conn:
+                return conn.execute("SELECT 1").fetchone() is not None
+
+        except Exception as e:
+            logger.error("Database ping failed: %s", e)
+            return False
+
+    def close(self):
+        """Close every pooled database connection."""
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+        while True:
+            try:
+                self._pool.get_nowait()
+            except queue.Empty:
+                break
+
+    def _row_to_user(self, row: sqlite3.Row) -> User:
+        """
+        Build a User object from a row of the users table.
+        Older databases are migrated in _initialize_database, so every
+        column is indexed directly.
+        """
+        return User(
+            id=row["id"],
+            email=row["email"],
+            preferred_language=row["preferred_language"],
+            preferred_difficulty=row["preferred_difficulty"],
+            solution_delivery=row["solution_delivery"],
+            solution_delay_hours=row["solution_delay_hours"],
+            preferred_time=row["preferred_time"],
+            timezone=row["timezone"],
+            is_active=bool(row["is_active"]),
+            created_at=row["created_at"],
+            updated_at=row["updated_at"]
+        )
+
+    def _row_to_problem(self, row: sqlite3.Row) -> Problem:
+        """Build a Problem object from a row of the problems table."""
+        return Problem(
+            id=row["id"],
+            title=row["title"],
+            description=row["description"],
+            difficulty=row["difficulty"],
+            test_cases=row["test_cases"] or "",
+            constraints=row["constraints"] or "",
+            examples=row["examples"] or "",
+            hints=row["hints"] or "",
+            tags=row["tags"] or "",
+            created_at=row["created_at"]
+        )
+
     def _initialize_database(self):
         """Create all necessary tables if they don't exist."""
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
 
             # Create users table
@@ -74,10 +265,24 @@ class DatabaseManager:
                     timezone TEXT DEFAULT 'UTC',
                     is_active BOOLEAN DEFAULT 1,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    total_sent INTEGER DEFAULT 0,
+                    by_difficulty_json TEXT DEFAULT '{}'
                 )
             """)
 
+            # Add columns missing from users tables created by older versions
+            self._user_columns = {
+                row["name"] for row in cursor.execute("PRAGMA table_info(users)")
+            }
+            # The sent-problem counters on users start empty when added
+            refresh_user_stats = "total_sent" not in self._user_columns
+            for column, definition in _USER_MIGRATION_COLUMNS.items():
+                if column not in self._user_columns:
+                    cursor.execute(f"ALTER TABLE users ADD COLUMN {column} {definition}")
+                    self._user_columns.add(column)
+                    logger.info("Added column users.%s", column)
+
             # Create problems table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS problems (
@@ -125,10 +330,223 @@ class DatabaseManager:
                 )
             """)
 
-            conn.commit()
+            # Create problem_tags table (one row per tag, so tag filters can use
+            # an index instead of parsing problems.tags); backfill it once
+            tags_table_exists = cursor.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'problem_tags'
+            """).fetchone() is not None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS problem_tags (
+                    problem_id INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (problem_id, tag),
+                    FOREIGN KEY (problem_id) REFERENCES problems (id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_problem_tags_tag
+                ON problem_tags (tag)
+            """)
+            if not tags_table_exists:
+                self._store_problem_tags(conn, cursor.execute("SELECT id, tags FROM problems"))
+
+            # One row per problem title. Older databases may hold duplicates, which
+            # are merged into the lowest ID before the unique index is created
+            title_index_exists = cursor.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_problems_title'
+            """).fetchone() is not None
+            if not title_index_exists and self._merge_duplicate_problems(cursor):
+                refresh_user_stats = True
+            cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS ux_problems_title
+                ON problems (title)
+            """)
+
+            # Index the difficulty filter used when picking unsent problems.
+            # sent_problems lookups by (user_id, problem_id) are already served
+            # by the index behind its UNIQUE(user_id, problem_id) constraint.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_problems_difficulty
+                ON problems (difficulty)
+            """)
+
+            # Partial index covering only active users, for the daily run's
+            # active-user scans. users.email lookups use the UNIQUE index.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_users_active
+                ON users (is_active) WHERE is_active = 1
+            """)
+
+            # Per-user status breakdowns in the stats queries
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sent_problems_user_status
+                ON sent_problems (user_id, email_status)
+            """)
+
+            if refresh_user_stats:
+                self._refresh_user_stats(cursor)
+
             logger.info("Database initialized successfully")
 
+    def _merge_duplicate_problems(self, cursor: sqlite3.Cursor) -> int:
+        """
+        Merge problems that share a title into the one with the lowest ID,
+        repointing rows that reference the duplicates. A sent_problems or
+        problem_tags row that would collide with an existing row for the kept
+        problem is dropped. Runs inside _initialize_database's transaction.
+
+        Returns:
+            Number of duplicate problems removed
+        """
+        cursor.execute("""
+            CREATE TEMP TABLE problem_duplicates AS
+            SELECT p.id AS duplicate_id, k.keep_id
+            FROM problems p
+            JOIN (
+                SELECT title, MIN(id) AS keep_id FROM problems
+                GROUP BY title HAVING COUNT(*) > 1
+            ) k ON p.title = k.title AND p.id <> k.keep_id
+        """)
+
+        try:
+            merged = cursor.execute("SELECT COUNT(*) FROM problem_duplicates").fetchone()[0]
+            if not merged:
+                return 0
+
+            for table in ("sent_problems", "problem_tags", "solutions"):
+                cursor.execute(f"""
+                    UPDATE OR IGNORE {table}
+                    SET problem_id = (
+                        SELECT keep_id FROM problem_duplicates WHERE duplicate_id = problem_id
+                    )
+                    WHERE problem_id IN (SELECT duplicate_id FROM problem_duplicates)
+                """)
+                cursor.execute(f"""
+                    DELETE FROM {table}
+                    WHERE problem_id IN (SELECT duplicate_id FROM problem_duplicates)
+                """)
+
+            cursor.execute("""
+                DELETE FROM problems
+                WHERE id IN (SELECT duplicate_id FROM problem_duplicates)
+            """)
+            logger.info("Merged %s duplicate problems", merged)
+            return merged
+
+        finally:
+            cursor.execute("DROP TABLE problem_duplicates")
+
+    def _refresh_user_stats(self, cursor: sqlite3.Cursor):
+        """
+        Recompute every user's denormalized users.total_sent and
+        users.by_difficulty_json columns from sent_problems. Only used to
+        backfill the counters during migration; regular writes go through
+        _adjust_user_stats. Runs inside _initialize_database's transaction.
+
+        Args:
+            cursor: Cursor of the open transaction
+        """
+        cursor.execute("""
+            UPDATE users SET
+                total_sent = (
+                    SELECT COUNT(*) FROM sent_problems sp
+                    JOIN problems p ON p.id = sp.problem_id
+                    WHERE sp.user_id = users.id AND sp.email_status = 'sent'
+                ),
+                by_difficulty_json = (
+                    SELECT json_group_object(difficulty, sent_count) FROM (
+                        SELECT p.difficulty, COUNT(*) AS sent_count
+                        FROM sent_problems sp
+                        JOIN problems p ON p.id = sp.problem_id
+                        WHERE sp.user_id = users.id AND sp.email_status = 'sent'
+                        GROUP BY p.difficulty
+                    )
+                )
+        """)
+
+    def _adjust_user_stats(self, cursor: sqlite3.Cursor, changes: Dict[Tuple[int, str], Tuple[int, int]]):
+        """
+        Apply increments to the denormalized users.total_sent and
+        users.by_difficulty_json columns. A difficulty whose count drops to
+        zero is removed, matching what _refresh_user_stats produces.
+        Runs inside the caller's write transaction.
+
+        Args:
+            cursor: Cursor of the open transaction
+            changes: Maps (user_id, difficulty) to (total_sent delta, difficulty count delta)
+        """
+        params = [
+            {"user_id": user_id, "path": f'$."{difficulty}"', "total": total, "delta": delta}
+            for (user_id, difficulty), (total, delta) in changes.items()
+            if total or delta
+        ]
+        if not params:
+            return
+
+        cursor.executemany("""
+            UPDATE users SET
+                total_sent = COALESCE(total_sent, 0) + :total,
+                by_difficulty_json = CASE
+                    WHEN COALESCE(json_extract(by_difficulty_json, :path), 0) + :delta > 0
+                    THEN json_set(COALESCE(by_difficulty_json, '{}'), :path,
+                                  COALESCE(json_extract(by_difficulty_json, :path), 0) + :delta)
+                    ELSE json_remove(COALESCE(by_difficulty_json, '{}'), :path)
+                END
+            WHERE id = :user_id
+        """, params)
+
+    def _row_to_stats(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Build a user's stats dictionary from the counters on their users row."""
+        return {
+            "total_sent": row["total_sent"] or 0,
+            "by_difficulty": json.loads(row["by_difficulty_json"] or "{}")
+        }
+
     # User management methods
+    def _cached_user_lookup(self, key: Tuple[str, Any], query: str) -> Optional[User]:
+        """
+        Look a user up through the user cache, running query on a miss.
+
+        Args:
+            key: ("email", email) or ("id", user_id); the value is the query parameter
+            query: SELECT returning at most one users row
+
+        Returns:
+            A copy of the cached User object, or None if no user matches
+        """
+        with self._user_cache_lock:
+            user = self._user_cache.get(key)
+            generation = self._user_cache_generation
+
+        if user is None:
+            with self._borrow() as conn:
+                row = conn.execute(query, (key[1],)).fetchone()
+
+            if not row:
+                return None
+
+            user = self._row_to_user(row)
+            with self._user_cache_lock:
+                if generation == self._user_cache_generation:
+                    self._user_cache[("email", user.email)] = user
+                    self._user_cache[("id", user.id)] = user
+
+        # Hand out copies so callers can't modify the cached object
+        return replace(user)
+
+    def _invalidate_user(self, email: str, user_id: Optional[int] = None):
+        """
+        Drop the cached lookups for a user after a write to the user has
+        committed.
+        """
+        with self._user_cache_lock:
+            self._user_cache_generation += 1
+            cached = self._user_cache.pop(("email", email), None)
+            if cached is not None:
+                user_id = cached.id
+            if user_id is not None:
+                self._user_cache.pop(("id", user_id), None)
+
     def add_user(self, email: str, preferred_language: str = "python",
                  preferred_difficulty: str = "medium", solution_delivery: str = "with_problem",
                  solution_delay_hours: int = 24) -> Optional[User]:
@@ -144,176 +562,225 @@ class DatabaseManager:
             User object if successful, None otherwise
         """
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO users (email, preferred_language, preferred_difficulty, solution_delivery, solution_delay_hours)
                     VALUES (?, ?, ?, ?, ?)
+                    RETURNING *
                 """, (email, preferred_language, preferred_difficulty, solution_delivery, solution_delay_hours))
+                row = cursor.fetchone()
 
-                user_id = cursor.lastrowid
-                conn.commit()
-
-                logger.info(f"Added new user: {email}")
-                return self.get_user_by_id(user_id)
+            self._invalidate_user(email, row["id"])
+            logger.info("Added new user: %s", email)
+            return self._row_to_user(row)
 
         except sqlite3.IntegrityError:
-            logger.warning(f"User with email {email} already exists")
+            logger.warning("User with email %s already exists", email)
             return None
         except Exception as e:
-            logger.error(f"Error adding user {email}: {e}")
+            logger.error("Error adding user %s: %s", email, e)
             return None
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get a user by their email address."""
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
-                row = cursor.fetchone()
-
-                if row:
-                    return User(
-                        id=row["id"],
-                        email=row["email"],
-                        preferred_language=row["preferred_language"],
-                        preferred_difficulty=row["preferred_difficulty"],
-                        solution_delivery=row["solution_delivery"] if "solution_delivery" in row.keys() else "with_problem",
-                        solution_delay_hours=row["solution_delay_hours"] if "solution_delay_hours" in row.keys() else 24,
-                        preferred_time=row["preferred_time"] if "preferred_time" in row.keys() else "09:00",
-                        timezone=row["timezone"] if "timezone" in row.keys() else "UTC",
-                        is_active=bool(row["is_active"]),
-                        created_at=datetime.fromisoformat(row["created_at"]),
-                        updated_at=datetime.fromisoformat(row["updated_at"])
-                    )
-                return None
+            return self._cached_user_lookup(("email", email),
+                                            "SELECT * FROM users WHERE email = ?")
 
         except Exception as e:
-            logger.error(f"Error getting user by email {email}: {e}")
+            logger.error("Error getting user by email %s: %s", email, e)
             return None
 
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get a user by their ID."""
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-                row = cursor.fetchone()
-
-                if row:
-                    return User(
-                        id=row["id"],
-                        email=row["email"],
-                        preferred_language=row["preferred_language"],
-                        preferred_difficulty=row["preferred_difficulty"],
-                        solution_delivery=row["solution_delivery"] if "solution_delivery" in row.keys() else "with_problem",
-                        solution_delay_hours=row["solution_delay_hours"] if "solution_delay_hours" in row.keys() else 24,
-                        preferred_time=row["preferred_time"] if "preferred_time" in row.keys() else "09:00",
-                        timezone=row["timezone"] if "timezone" in row.keys() else "UTC",
-                        is_active=bool(row["is_active"]),
-                        created_at=datetime.fromisoformat(row["created_at"]),
-                        updated_at=datetime.fromisoformat(row["updated_at"])
-                    )
-                return None
+            return self._cached_user_lookup(("id", user_id),
+                                            "SELECT * FROM users WHERE id = ?")
 
         except Exception as e:
-            logger.error(f"Error getting user by ID {user_id}: {e}")
+            logger.error("Error getting user by ID %s: %s", user_id, e)
             return None
 
     def update_user_preferences(self, email: str, preferred_language: str = None,
                                preferred_difficulty: str = None) -> bool:
         """Update user preferences."""
+        updates = []
+        params = []
+
+        if preferred_language:
+            updates.append("preferred_language = ?")
+            params.append(preferred_language)
+
+        if preferred_difficulty:
+            updates.append("preferred_difficulty = ?")
+            params.append(preferred_difficulty)
+
+        if not updates:
+            return False
+
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+        params.append(email)
+
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
+                query = f"UPDATE users SET {', '.join(updates)} WHERE email = ?"
+                cursor.execute(query, params)
+                updated = cursor.rowcount > 0
 
-                updates = []
-                params = []
+            self._invalidate_user(email)
+            logger.info("Updated preferences for user: %s", email)
+            return updated
 
-                if preferred_language:
-                    updates.append("preferred_language = ?")
-                    params.append(preferred_language)
-
-                if preferred_difficulty:
-                    updates.append("preferred_difficulty = ?")
-                    params.append(preferred_difficulty)
+        except Exception as e:
+            logger.error("Error updating user preferences for %s: %s", email, e)
+            return False
 
-                if updates:
-                    updates.append("updated_at = CURRENT_TIMESTAMP")
-                    params.append(email)
+    def set_user_active(self, email: str, active: bool) -> bool:
+        """
+        Set whether a user is subscribed.
 
-                    query = f"UPDATE users SET {', '.join(updates)} WHERE email = ?"
-                    cursor.execute(query, params)
-                    conn.commit()
+        Args:
+            email: User's email address
+            active: True to activate the user, False to deactivate
 
-                    logger.info(f"Updated preferences for user: {email}")
-                    return cursor.rowcount > 0
+        Returns:
+            True if the user exists, False otherwise
+        """
+        try:
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE users
+                    SET is_active = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE email = ?
+                """, (int(active), email))
+                updated = cursor.rowcount > 0
 
-                return False
+            self._invalidate_user(email)
+            logger.info("%s user: %s", "Activated" if active else "Deactivated", email)
+            return updated
 
         except Exception as e:
-            logger.error(f"Error updating user preferences for {email}: {e}")
+            logger.error("Error setting active=%s for user %s: %s", active, email, e)
             return False
 
     def deactivate_user(self, email: str) -> bool:
         """Deactivate a user (unsubscribe)."""
+        return self.set_user_active(email, False)
+
+    def reactivate_user(self, email: str, preferred_language: str,
+                        preferred_difficulty: str) -> Optional[User]:
+        """
+        Reactivate a user and set new preferences in a single statement.
+
+        Args:
+            email: User's email address
+            preferred_language: New preferred programming language
+            preferred_difficulty: New preferred problem difficulty
+
+        Returns:
+            Updated User object if the user exists, None otherwise
+        """
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE users
-                    SET is_active = 0, updated_at = CURRENT_TIMESTAMP
+                    SET is_active = 1, preferred_language = ?, preferred_difficulty = ?,
+                        updated_at = CURRENT_TIMESTAMP
                     WHERE email = ?
-                """, (email,))
-                conn.commit()
+                    RETURNING *
+                """, (preferred_language, preferred_difficulty, email))
+                row = cursor.fetchone()
 
-                logger.info(f"Deactivated user: {email}")
-                return cursor.rowcount > 0
+            self._invalidate_user(email)
+            if row:
+                logger.info("Reactivated user: %s", email)
+                return self._row_to_user(row)
+            return None
 
         except Exception as e:
-            logger.error(f"Error deactivating user {email}: {e}")
-            return False
+            logger.error("Error reactivating user %s: %s", email, e)
+            return None
 
     def get_active_users(self) -> List[User]:
         """Get all active users."""
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM users WHERE is_active = 1")
-                rows = cursor.fetchall()
-
-                users = []
-                for row in rows:
-                    users.append(User(
-                        id=row["id"],
-                        email=row["email"],
-                        preferred_language=row["preferred_language"],
-                        preferred_difficulty=row["preferred_difficulty"],
-                        solution_delivery=row["solution_delivery"] if "solution_delivery" in row.keys() else "with_problem",
-                        solution_delay_hours=row["solution_delay_hours"] if "solution_delay_hours" in row.keys() else 24,
-                        preferred_time=row["preferred_time"] if "preferred_time" in row.keys() else "09:00",
-                        timezone=row["timezone"] if "timezone" in row.keys() else "UTC",
-                        is_active=bool(row["is_active"]),
-                        created_at=datetime.fromisoformat(row["created_at"]),
-                        updated_at=datetime.fromisoformat(row["updated_at"])
-                    ))
-
-                return users
+        # Read in pages, so only one page of rows is held alongside the users
+        return list(self.iter_active_users())
 
-        except Exception as e:
-            logger.error(f"Error getting active users: {e}")
-            return []
+    def iter_active_users(self, batch_size: int = 500) -> Iterator[User]:
+        """
+        Yield all active users, reading them from the database in batches.
+        Each batch is a separate keyset-paginated query, so no cursor or
+        connection is held open while the caller works on the yielded users.
+
+        Args:
+            batch_size: Number of users fetched per query
+
+        Yields:
+            Active User objects ordered by ID
+        """
+        last_id = 0
+
+        while True:
+            try:
+                with self._borrow() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT * FROM users
+                        WHERE is_active = 1 AND id > ?
+                        ORDER BY id
+                        LIMIT ?
+                    """, (last_id, batch_size))
+                    rows = cursor.fetchall()
+
+            except Exception as e:
+                logger.error("Error iterating active users after ID %s: %s", last_id, e)
+                return
+
+            for row in rows:
+                yield self._row_to_user(row)
+
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["id"]
 
     # Problem management methods
+    def _store_problem_tags(self, conn: sqlite3.Connection, rows):
+        """
+        Write problem_tags rows for problems given as (id, tags JSON) pairs.
+        Must be called inside the transaction that wrote the problems.
+        """
+        conn.executemany(
+            "INSERT OR IGNORE INTO problem_tags (problem_id, tag) VALUES (?, ?)",
+            [
+                (problem_id, tag)
+                for problem_id, tags in rows
+                for tag in Problem(tags=tags or "").get_tags()
+                if isinstance(tag, str)
+            ]
+        )
+
     def add_problem(self, problem: Problem) -> Optional[Problem]:
-        """Add a new problem to the database."""
+        """
+        Add a new problem to the database. If a problem with the same title
+        already exists, its difficulty is updated and it is returned instead.
+        """
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
+                existing = cursor.execute(
+                    "SELECT id, difficulty FROM problems WHERE title = ?", (problem.title,)
+                ).fetchone()
+
                 cursor.execute("""
                     INSERT INTO problems (title, description, difficulty, test_cases,
                                         constraints, examples, hints, tags)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (title) DO UPDATE SET difficulty = excluded.difficulty
+                    RETURNING *
                 """, (
                     problem.title,
                     problem.description,
@@ -324,131 +791,306 @@ class DatabaseManager:
                     problem.hints,
                     problem.tags
                 ))
+                row = cursor.fetchone()
+                self._store_problem_tags(conn, [(row["id"], row["tags"])])
 
-                problem_id = cursor.lastrowid
-                conn.commit()
+                # A changed difficulty moves the problem between users' per-difficulty counts
+                if existing and existing["difficulty"] != row["difficulty"]:
+                    changes = {}
+                    for (user_id,) in cursor.execute("""
+                        SELECT user_id FROM sent_problems
+                        WHERE problem_id = ? AND email_status = 'sent'
+                    """, (row["id"],)).fetchall():
+                        changes[(user_id, existing["difficulty"])] = (0, -1)
+                        changes[(user_id, row["difficulty"])] = (0, 1)
+                    self._adjust_user_stats(cursor, changes)
 
-                logger.info(f"Added new problem: {problem.title}")
-                return self.get_problem_by_id(problem_id)
+            logger.debug("Added new problem: %s", problem.title)
+            return self._row_to_problem(row)
 
         except Exception as e:
-            logger.error(f"Error adding problem {problem.title}: {e}")
+            logger.error("Error adding problem %s: %s", problem.title, e)
             return None
 
+    def add_problems_bulk(self, problems: List[Problem]) -> int:
+        """
+        Add many problems in a single transaction, skipping any whose title
+        is already in the database.
+
+        Args:
+            problems: Problems to insert
+
+        Returns:
+            Number of problems inserted
+        """
+        try:
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+                # New rows get AUTOINCREMENT IDs above the current maximum
+                last_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM problems").fetchone()[0]
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO problems (title, description, difficulty, test_cases,
+                                                  constraints, examples, hints, tags)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (
+                        problem.title,
+                        problem.description,
+                        problem.difficulty,
+                        problem.test_cases,
+                        problem.constraints,
+                        problem.examples,
+                        problem.hints,
+                        problem.tags
+                    )
+                    for problem in problems
+                ])
+                added = cursor.rowcount
+
+                self._store_problem_tags(
+                    conn, cursor.execute("SELECT id, tags FROM problems WHERE id > ?", (last_id,))
+                )
+
+                logger.info("Added %s problems in bulk", added)
+                return added
+
+        except Exception as e:
+            logger.error("Error adding %s problems in bulk: %s", len(problems), e)
+            return 0
+
     def get_problem_by_id(self, problem_id: int) -> Optional[Problem]:
         """Get a problem by its ID."""
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM problems WHERE id = ?", (problem_id,))
-                row = cursor.fetchone()
+            with self._borrow() as conn:
+                row = conn.execute("SELECT * FROM problems WHERE id = ?", (problem_id,)).fetchone()
 
-                if row:
-                    return Problem(
-                        id=row["id"],
-                        title=row["title"],
-                        description=row["description"],
-                        difficulty=row["difficulty"],
-                        test_cases=row["test_cases"] or "",
-                        constraints=row["constraints"] or "",
-                        examples=row["examples"] or "",
-                        hints=row["hints"] or "",
-                        tags=row["tags"] or "",
-                        created_at=datetime.fromisoformat(row["created_at"])
-                    )
-                return None
+            if row:
+                return self._row_to_problem(row)
+            return None
 
         except Exception as e:
-            logger.error(f"Error getting problem by ID {problem_id}: {e}")
+            logger.error("Error getting problem by ID %s: %s", problem_id, e)
             return None
 
-    def get_unsent_problem_for_user(self, user_id: int, difficulty: str) -> Optional[Problem]:
-        """Get a problem that hasn't been sent to the user yet."""
+    def get_problem_titles(self) -> Set[str]:
+        """
+        Get the titles of all stored problems.
+
+        Returns:
+            Set of problem titles
+        """
         try:
-            with self._get_connection() as conn:
+            with self._borrow() as conn:
+                rows = conn.execute("SELECT title FROM problems").fetchall()
+
+            return {row[0] for row in rows}
+
+        except Exception as e:
+            logger.error("Error getting problem titles: %s", e)
+            return set()
+
+    def get_problems_by_tag(self, tag: str) -> List[Problem]:
+        """
+        Get all problems with a tag.
+
+        Args:
+            tag: Tag to filter by, e.g. "array"
+
+        Returns:
+            List of matching Problem objects ordered by ID
+        """
+        try:
+            with self._borrow() as conn:
+                rows = conn.execute("""
+                    SELECT p.* FROM problem_tags t
+                    JOIN problems p ON p.id = t.problem_id
+                    WHERE t.tag = ?
+                    ORDER BY p.id
+                """, (tag,)).fetchall()
+
+            return [self._row_to_problem(row) for row in rows]
+
+        except Exception as e:
+            logger.error("Error getting problems tagged %s: %s", tag, e)
+            return []
+
+    def get_unsent_problems_for_users(self, users: List[User]) -> Dict[int, Problem]:
+        """
+        Pick one random unsent problem of the preferred difficulty for each user.
+        Candidates are streamed unsorted and sampled per user in Python
+        (reservoir sampling), rather than random-sorting every candidate with
+        ORDER BY RANDOM(); only the picked problems are then loaded in full.
+
+        Args:
+            users: Users to pick problems for
+
+        Returns:
+            Dictionary mapping user ID to Problem; users with nothing left are omitted
+        """
+        problems = {}
+        user_ids = [user.id for user in users]
+
+        try:
+            # user ID -> (candidates seen so far, picked problem ID)
+            picks: Dict[int, Tuple[int, int]] = {}
+            rows = []
+
+            with self._borrow() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT p.* FROM problems p
-                    WHERE p.difficulty = ?
-                    AND p.id NOT IN (
-                        SELECT sp.problem_id FROM sent_problems sp
-                        WHERE sp.user_id = ?
-                    )
-                    ORDER BY RANDOM()
-                    LIMIT 1
-                """, (difficulty, user_id))
 
-                row = cursor.fetchone()
+                # Chunk the IDs to stay under SQLite's bound-parameter limit.
+                # Anti-join, driven by the UNIQUE(user_id, problem_id) index.
+                for start in range(0, len(user_ids), 500):
+                    chunk = user_ids[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor.execute(f"""
+                        SELECT u.id, p.id
+                        FROM users u
+                        JOIN problems p ON p.difficulty = u.preferred_difficulty
+                        LEFT JOIN sent_problems sp
+                            ON sp.user_id = u.id AND sp.problem_id = p.id
+                        WHERE u.id IN ({placeholders}) AND sp.problem_id IS NULL
+                    """, chunk)
 
-                if row:
-                    return Problem(
-                        id=row["id"],
-                        title=row["title"],
-                        description=row["description"],
-                        difficulty=row["difficulty"],
-                        test_cases=row["test_cases"] or "",
-                        constraints=row["constraints"] or "",
-                        examples=row["examples"] or "",
-                        hints=row["hints"] or "",
-                        tags=row["tags"] or "",
-                        created_at=datetime.fromisoformat(row["created_at"])
-                    )
-                return None
+                    # Keep the n-th candidate with probability 1/n, so each
+                    # user's pick is uniform over their unsent problems
+                    for user_id, problem_id in cursor:
+                        seen, pick = picks.get(user_id, (0, None))
+                        seen += 1
+                        if random.randrange(seen) == 0:
+                            pick = problem_id
+                        picks[user_id] = (seen, pick)
+
+                picked_ids = sorted({problem_id for _, problem_id in picks.values()})
+                for start in range(0, len(picked_ids), 500):
+                    chunk = picked_ids[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(cursor.execute(
+                        f"SELECT * FROM problems WHERE id IN ({placeholders})", chunk
+                    ).fetchall())
+
+            by_id = {row["id"]: self._row_to_problem(row) for row in rows}
+            for user_id, (_, problem_id) in picks.items():
+                # Users sharing a pick get their own Problem object
+                problems[user_id] = replace(by_id[problem_id])
+
+            return problems
 
         except Exception as e:
-            logger.error(f"Error getting unsent problem for user {user_id}: {e}")
-            return None
+            logger.error("Error getting unsent problems for %s users: %s", len(user_ids), e)
+            return problems
 
     # Sent problems tracking
     def mark_problem_sent(self, user_id: int, problem_id: int,
                          solution_language: str, email_status: str = "sent") -> bool:
         """Mark a problem as sent to a user."""
+        return self.mark_problems_sent_bulk(
+            [(user_id, problem_id, solution_language, email_status)]
+        )
+
+    def mark_problems_sent_bulk(self, rows: List[Tuple[int, int, str, str]]) -> bool:
+        """
+        Mark many problems as sent in a single transaction.
+
+        Args:
+            rows: (user_id, problem_id, solution_language, email_status) tuples
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not rows:
+            return True
+
+        # The last row for a (user, problem) pair wins, as with the REPLACE below
+        new_status = {(row[0], row[1]): row[3] for row in rows}
+        pairs = list(new_status)
+        problem_ids = sorted({problem_id for _, problem_id in pairs})
+
         try:
-            with self._get_connection() as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
+
+                # Previous status of each pair and the difficulty of each problem,
+                # so the counters only move for rows that change to or from 'sent'.
+                # Chunked to stay under SQLite's bound-parameter limit.
+                old_status = {}
+                for start in range(0, len(pairs), 250):
+                    chunk = pairs[start:start + 250]
+                    placeholders = ",".join("(?, ?)" for _ in chunk)
+                    cursor.execute(f"""
+                        SELECT user_id, problem_id, email_status FROM sent_problems
+                        WHERE (user_id, problem_id) IN (VALUES {placeholders})
+                    """, [value for pair in chunk for value in pair])
+                    old_status.update({(r[0], r[1]): r[2] for r in cursor.fetchall()})
+
+                difficulties = {}
+                for start in range(0, len(problem_ids), 500):
+                    chunk = problem_ids[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor.execute(
+                        f"SELECT id, difficulty FROM problems WHERE id IN ({placeholders})", chunk
+                    )
+                    difficulties.update(cursor.fetchall())
+
+                cursor.executemany("""
                     INSERT OR REPLACE INTO sent_problems
                     (user_id, problem_id, solution_language, email_status)
                     VALUES (?, ?, ?, ?)
-                """, (user_id, problem_id, solution_language, email_status))
-                conn.commit()
+                """, rows)
+
+                # Keep the per-user counters in step, in the same transaction
+                changes = {}
+                for (user_id, problem_id), status in new_status.items():
+                    was_sent = old_status.get((user_id, problem_id)) == "sent"
+                    step = (status == "sent") - was_sent
+                    if step and problem_id in difficulties:
+                        key = (user_id, difficulties[problem_id])
+                        total, delta = changes.get(key, (0, 0))
+                        changes[key] = (total + step, delta + step)
+                self._adjust_user_stats(cursor, changes)
 
-                logger.info(f"Marked problem {problem_id} as sent to user {user_id}")
+                logger.debug("Marked %s problems as sent", len(rows))
                 return True
 
         except Exception as e:
-            logger.error(f"Error marking problem sent: {e}")
+            logger.error("Error marking %s problems sent: %s", len(rows), e)
             return False
 
     def get_user_stats(self, user_id: int) -> Dict[str, Any]:
         """Get statistics for a user."""
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with self._borrow() as conn:
+                row = conn.execute("""
+                    SELECT total_sent, by_difficulty_json FROM users WHERE id = ?
+                """, (user_id,)).fetchone()
 
-                # Count total problems sent
-                cursor.execute("""
-                    SELECT COUNT(*) as total_sent FROM sent_problems
-                    WHERE user_id = ? AND email_status = 'sent'
-                """, (user_id,))
-                total_sent = cursor.fetchone()["total_sent"]
+            if row:
+                return self._row_to_stats(row)
+            return {"total_sent": 0, "by_difficulty": {}}
 
-                # Count by difficulty
-                cursor.execute("""
-                    SELECT p.difficulty, COUNT(*) as count
-                    FROM sent_problems sp
-                    JOIN problems p ON sp.problem_id = p.id
-                    WHERE sp.user_id = ? AND sp.email_status = 'sent'
-                    GROUP BY p.difficulty
-                """, (user_id,))
+        except Exception as e:
+            logger.error("Error getting user stats for %s: %s", user_id, e)
+            return {"total_sent": 0, "by_difficulty": {}}
+
+    def get_user_with_stats(self, email: str) -> Optional[Tuple[User, Dict[str, Any]]]:
+        """
+        Get a user and their statistics in a single query.
+
+        Args:
+            email: User's email address
+
+        Returns:
+            (User, stats) tuple if the user exists, None otherwise
+        """
+        try:
+            with self._borrow() as conn:
+                row = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
 
-                difficulty_stats = {row["difficulty"]: row["count"] for row in cursor.fetchall()}
+            if not row:
+                return None
 
-                return {
-                    "total_sent": total_sent,
-                    "by_difficulty": difficulty_stats
-                }
+            return self._row_to_user(row), self._row_to_stats(row)
 
         except Exception as e:
-            logger.error(f"Error getting user stats for {user_id}: {e}")
-            return {"total_sent": 0, "by_difficulty": {}}
+            logger.error("Error getting user with stats for %s: %s", email, e)
+            return None
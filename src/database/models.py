@@ -3,12 +3,17 @@ Database models for the Leetcode Email Agent.
 This file defines the structure of our database tables.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 import json
 
-@dataclass
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; its errors subclass json.JSONDecodeError
+    from json import loads as _loads
+
+@dataclass(slots=True)
 class User:
     """
     Represents a user who has subscribed to receive daily coding problems.
@@ -37,7 +42,7 @@ class User:
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
 
-@dataclass
+@dataclass(slots=True)
 class Problem:
     """
     Represents a coding problem with all necessary details.
@@ -52,34 +57,43 @@ class Problem:
     hints: str = ""  # JSON string of hints
     tags: str = ""  # JSON string of problem tags (e.g., ["array", "sorting"])
     created_at: Optional[datetime] = None
+    # Parsed JSON fields, keyed by field name, as (raw string, parsed value)
+    _parsed: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def _parse_json_field(self, name: str) -> list:
+        """
+        Parse one of the JSON string fields, reusing the previous result
+        as long as the field's string hasn't been replaced.
+        The returned list is shared between calls, so treat it as read-only.
+        """
+        raw = getattr(self, name)
+        cached = self._parsed.get(name)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
 
-    def get_test_cases(self) -> List[Dict[str, Any]]:
-        """Parse test cases from JSON string."""
         try:
-            return json.loads(self.test_cases) if self.test_cases else []
+            value = _loads(raw) if raw else []
         except json.JSONDecodeError:
-            return []
+            value = []
+
+        self._parsed[name] = (raw, value)
+        return value
+
+    def get_test_cases(self) -> List[Dict[str, Any]]:
+        """Parse test cases from JSON string."""
+        return self._parse_json_field("test_cases")
 
     def get_examples(self) -> List[Dict[str, Any]]:
         """Parse examples from JSON string."""
-        try:
-            return json.loads(self.examples) if self.examples else []
-        except json.JSONDecodeError:
-            return []
+        return self._parse_json_field("examples")
 
     def get_hints(self) -> List[str]:
         """Parse hints from JSON string."""
-        try:
-            return json.loads(self.hints) if self.hints else []
-        except json.JSONDecodeError:
-            return []
+        return self._parse_json_field("hints")
 
     def get_tags(self) -> List[str]:
         """Parse tags from JSON string."""
-        try:
-            return json.loads(self.tags) if self.tags else []
-        except json.JSONDecodeError:
-            return []
+        return self._parse_json_field("tags")
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert problem object to dictionary for easy serialization."""
@@ -96,7 +110,7 @@ class Problem:
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
 
-@dataclass
+@dataclass(slots=True)
 class SentProblem:
     """
     Tracks which problems have been sent to which users to avoid duplicates.
@@ -119,7 +133,7 @@ class SentProblem:
             "solution_language": self.solution_language
         }
 
-@dataclass
+@dataclass(slots=True)
 class Solution:
     """
     Represents a generated solution for a problem.
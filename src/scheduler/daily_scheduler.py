@@ -4,12 +4,19 @@ This module handles scheduling and running daily email tasks.
 """
 
 import logging
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Optional, Callable, Dict, Any
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+from itertools import islice
+from typing import Optional, Callable, Dict, Any, Tuple
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
+from apscheduler.events import (
+    EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_SUBMITTED,
+    EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES
+)
+import pytz
 
 try:
     from ..config import Config
@@ -20,6 +27,35 @@ except ImportError:
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# Number of job results kept in memory for get_job_history
+JOB_HISTORY_SIZE = 1024
+
+# Daily cron triggers keyed by (hour, minute, timezone name), shared by every
+# scheduler so restarts and reschedules to a known slot reuse the trigger
+_trigger_cache: Dict[Tuple[int, int, str], CronTrigger] = {}
+
+def _get_trigger(hour: int, minute: int, timezone: str) -> CronTrigger:
+    """
+    Get the daily CronTrigger for a run time, building it on first use.
+    The timezone name is resolved with pytz (which APScheduler 3.x uses itself)
+    once, when the trigger is built.
+
+    Args:
+        hour: Hour of the day (0-23)
+        minute: Minute of the hour (0-59)
+        timezone: IANA timezone name, e.g. "UTC" or "Europe/Berlin"
+
+    Returns:
+        CronTrigger firing once a day at the given time
+    """
+    key = (hour, minute, timezone)
+    trigger = _trigger_cache.get(key)
+    if trigger is None:
+        trigger = _trigger_cache.setdefault(
+            key, CronTrigger(hour=hour, minute=minute, timezone=pytz.timezone(timezone))
+        )
+    return trigger
+
 class DailyScheduler:
     """
     Scheduler for running daily email tasks.
@@ -37,11 +73,39 @@ class DailyScheduler:
         self.scheduler = BackgroundScheduler()
         self.is_running = False
         self.last_run_result = None
+        self._history = deque(maxlen=JOB_HISTORY_SIZE)  # Oldest results drop off
+
+        # Next fire time of the daily job, refreshed when the job is
+        # (re)scheduled and after each run rather than on every status poll
+        self._next_run_time: Optional[datetime] = None
         self.job_id = "daily_leetcode_emails"
 
+        # The parts of get_status that only change when the job is rescheduled
+        self._rebuild_status_template(
+            Config.SCHEDULER_HOUR, Config.SCHEDULER_MINUTE, Config.SCHEDULER_TIMEZONE
+        )
+
+        # Set whenever no job run is in progress, so waiters block on it
+        # instead of polling
+        self._completion_event = threading.Event()
+        self._completion_event.set()
+
+        # Held while the job runs, so a manual run_now and a scheduled run
+        # never overlap (APScheduler's max_instances only covers the latter)
+        self._job_lock = threading.Lock()
+
+        # Number of _run_daily_job calls currently executing
+        self._in_flight = 0
+        self._state_lock = threading.Lock()
+
         # Add event listeners
         self.scheduler.add_listener(self._job_executed, EVENT_JOB_EXECUTED)
         self.scheduler.add_listener(self._job_error, EVENT_JOB_ERROR)
+        # APScheduler advances next_run_time as it submits (or skips) a run, so
+        # refresh the cached value on those events too, not only after a run
+        self.scheduler.add_listener(
+            self._job_dispatched, EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
 
         logger.info("DailyScheduler initialized")
 
@@ -60,10 +124,10 @@ class DailyScheduler:
             # Add the daily job
             self.scheduler.add_job(
                 func=self._run_daily_job,
-                trigger=CronTrigger(
-                    hour=Config.SCHEDULER_HOUR,
-                    minute=Config.SCHEDULER_MINUTE,
-                    timezone=Config.SCHEDULER_TIMEZONE
+                trigger=_get_trigger(
+                    Config.SCHEDULER_HOUR,
+                    Config.SCHEDULER_MINUTE,
+                    Config.SCHEDULER_TIMEZONE
                 ),
                 id=self.job_id,
                 name="Daily LeetCode Email Job",
@@ -74,15 +138,18 @@ class DailyScheduler:
             # Start the scheduler
             self.scheduler.start()
             self.is_running = True
+            self._refresh_next_run_time()
+            self._rebuild_status_template(
+                Config.SCHEDULER_HOUR, Config.SCHEDULER_MINUTE, Config.SCHEDULER_TIMEZONE
+            )
 
-            logger.info(f"Scheduler started - daily emails will be sent at "
-                       f"{Config.SCHEDULER_HOUR:02d}:{Config.SCHEDULER_MINUTE:02d} "
-                       f"{Config.SCHEDULER_TIMEZONE}")
+            logger.info("Scheduler started - daily emails will be sent at %02d:%02d %s",
+                        Config.SCHEDULER_HOUR, Config.SCHEDULER_MINUTE, Config.SCHEDULER_TIMEZONE)
 
             return True
 
         except Exception as e:
-            logger.error(f"Failed to start scheduler: {e}")
+            logger.error("Failed to start scheduler: %s", e)
             return False
 
     def stop(self) -> bool:
@@ -104,7 +171,7 @@ class DailyScheduler:
             return True
 
         except Exception as e:
-            logger.error(f"Failed to stop scheduler: {e}")
+            logger.error("Failed to stop scheduler: %s", e)
             return False
 
     def run_now(self) -> Dict[str, Any]:
@@ -119,34 +186,54 @@ class DailyScheduler:
 
     def _run_daily_job(self) -> Dict[str, Any]:
         """
-        Execute the daily job function.
+        Execute the daily job function, unless a run is already in progress.
 
         Returns:
-            Dictionary with job execution results
+            Dictionary with job execution results; job_status is
+            "skipped_overlap" if another run was in progress
         """
+        if not self._job_lock.acquire(blocking=False):
+            logger.warning("Daily job is already running, skipping this run")
+            return {
+                "job_status": "skipped_overlap",
+                "emails_sent": 0,
+                "emails_failed": 0,
+                "total_users": 0,
+                "errors": []
+            }
+
+        with self._state_lock:
+            self._in_flight += 1
+            self._completion_event.clear()
+
+        # Durations come from the monotonic clock; wall-clock UTC times are
+        # only recorded for display
+        start_ns = time.monotonic_ns()
+        start_iso = datetime.now(dt_timezone.utc).isoformat()
+
         try:
             logger.info("Starting daily job execution")
-            start_time = datetime.now()
 
             # Call the job function
             result = self.job_function()
 
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = (time.monotonic_ns() - start_ns) / 1e9
 
             # Enhance result with execution metadata
             result.update({
                 "job_execution_time": duration,
-                "job_start_time": start_time.isoformat(),
-                "job_end_time": end_time.isoformat(),
+                "job_start_time": start_iso,
+                "job_end_time": datetime.now(dt_timezone.utc).isoformat(),
                 "job_status": "completed"
             })
 
             self.last_run_result = result
+            self._history.append(result)
 
-            logger.info(f"Daily job completed successfully in {duration:.2f} seconds")
-            logger.info(f"Emails sent: {result.get('emails_sent', 0)}, "
-                       f"Failed: {result.get('emails_failed', 0)}")
+            logger.info("Daily job completed successfully in %.2f seconds", duration)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Emails sent: %s, Failed: %s",
+                            result.get('emails_sent', 0), result.get('emails_failed', 0))
 
             return result
 
@@ -154,9 +241,9 @@ class DailyScheduler:
             error_result = {
                 "job_status": "failed",
                 "error": str(e),
-                "job_execution_time": 0,
-                "job_start_time": datetime.now().isoformat(),
-                "job_end_time": datetime.now().isoformat(),
+                "job_execution_time": (time.monotonic_ns() - start_ns) / 1e9,
+                "job_start_time": start_iso,
+                "job_end_time": datetime.now(dt_timezone.utc).isoformat(),
                 "emails_sent": 0,
                 "emails_failed": 0,
                 "total_users": 0,
@@ -164,17 +251,45 @@ class DailyScheduler:
             }
 
             self.last_run_result = error_result
-            logger.error(f"Daily job failed: {e}")
+            self._history.append(error_result)
+            logger.error("Daily job failed: %s", e)
 
             return error_result
 
+        finally:
+            with self._state_lock:
+                self._in_flight -= 1
+                if not self._in_flight:
+                    self._completion_event.set()
+            self._job_lock.release()
+
     def _job_executed(self, event):
         """Handle job execution event."""
-        logger.info(f"Job {event.job_id} executed successfully")
+        logger.info("Job %s executed successfully", event.job_id)
+        self._refresh_next_run_time()
 
     def _job_error(self, event):
         """Handle job error event."""
-        logger.error(f"Job {event.job_id} failed: {event.exception}")
+        logger.error("Job %s failed: %s", event.job_id, event.exception)
+        self._refresh_next_run_time()
+
+    def _job_dispatched(self, event):
+        """Handle job submitted, missed and max-instances events."""
+        if event.code == EVENT_JOB_MISSED:
+            logger.warning("Job %s missed its scheduled run time", event.job_id)
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            logger.warning("Job %s skipped: previous run still in progress", event.job_id)
+        self._refresh_next_run_time()
+
+    def _refresh_next_run_time(self):
+        """Re-read the daily job's next fire time from the scheduler."""
+        try:
+            job = self.scheduler.get_job(self.job_id)
+            self._next_run_time = job.next_run_time if job else None
+
+        except Exception as e:
+            logger.error("Error getting next run time: %s", e)
+            self._next_run_time = None
 
     def get_next_run_time(self) -> Optional[datetime]:
         """
@@ -183,18 +298,7 @@ class DailyScheduler:
         Returns:
             Next run time as datetime object, or None if not scheduled
         """
-        try:
-            if not self.is_running:
-                return None
-
-            job = self.scheduler.get_job(self.job_id)
-            if job:
-                return job.next_run_time
-            return None
-
-        except Exception as e:
-            logger.error(f"Error getting next run time: {e}")
-            return None
+        return self._next_run_time if self.is_running else None
 
     def get_last_run_result(self) -> Optional[Dict[str, Any]]:
         """
@@ -205,6 +309,14 @@ class DailyScheduler:
         """
         return self.last_run_result
 
+    def _rebuild_status_template(self, hour: int, minute: int, timezone: str):
+        """Rebuild the static part of get_status for the job's current schedule."""
+        self._status_template = {
+            "scheduled_time": f"{hour:02d}:{minute:02d}",
+            "timezone": timezone,
+            "job_id": self.job_id
+        }
+
     def get_status(self) -> Dict[str, Any]:
         """
         Get scheduler status information.
@@ -214,17 +326,13 @@ class DailyScheduler:
         """
         next_run = self.get_next_run_time()
 
-        status = {
+        return {
+            **self._status_template,
             "is_running": self.is_running,
             "next_run_time": next_run.isoformat() if next_run else None,
-            "scheduled_time": f"{Config.SCHEDULER_HOUR:02d}:{Config.SCHEDULER_MINUTE:02d}",
-            "timezone": Config.SCHEDULER_TIMEZONE,
-            "last_run_result": self.last_run_result,
-            "job_id": self.job_id
+            "last_run_result": self.last_run_result
         }
 
-        return status
-
     def reschedule(self, hour: int = None, minute: int = None, timezone: str = None) -> bool:
         """
         Reschedule the daily job with new time settings.
@@ -245,39 +353,41 @@ class DailyScheduler:
 
             # Validate inputs
             if not (0 <= new_hour <= 23):
-                logger.error(f"Invalid hour: {new_hour}. Must be 0-23")
+                logger.error("Invalid hour: %s. Must be 0-23", new_hour)
                 return False
 
             if not (0 <= new_minute <= 59):
-                logger.error(f"Invalid minute: {new_minute}. Must be 0-59")
+                logger.error("Invalid minute: %s. Must be 0-59", new_minute)
                 return False
 
             if not self.is_running:
                 logger.warning("Scheduler is not running, cannot reschedule")
                 return False
 
+            # Resolve the trigger first, so an unknown timezone leaves the
+            # existing job in place
+            trigger = _get_trigger(new_hour, new_minute, new_timezone)
+
             # Remove existing job
             self.scheduler.remove_job(self.job_id)
 
             # Add job with new schedule
             self.scheduler.add_job(
                 func=self._run_daily_job,
-                trigger=CronTrigger(
-                    hour=new_hour,
-                    minute=new_minute,
-                    timezone=new_timezone
-                ),
+                trigger=trigger,
                 id=self.job_id,
                 name="Daily LeetCode Email Job",
                 replace_existing=True,
                 max_instances=1
             )
+            self._refresh_next_run_time()
+            self._rebuild_status_template(new_hour, new_minute, new_timezone)
 
-            logger.info(f"Rescheduled daily job to {new_hour:02d}:{new_minute:02d} {new_timezone}")
+            logger.info("Rescheduled daily job to %02d:%02d %s", new_hour, new_minute, new_timezone)
             return True
 
         except Exception as e:
-            logger.error(f"Failed to reschedule job: {e}")
+            logger.error("Failed to reschedule job: %s", e)
             return False
 
     def is_job_running(self) -> bool:
@@ -287,30 +397,12 @@ class DailyScheduler:
         Returns:
             True if job is running, False otherwise
         """
-        try:
-            if not self.is_running:
-                return False
-
-            job = self.scheduler.get_job(self.job_id)
-            if job:
-                # Check if job is currently running
-                running_jobs = self.scheduler.get_jobs()
-                for running_job in running_jobs:
-                    if running_job.id == self.job_id:
-                        # This is a simple check - APScheduler doesn't provide
-                        # a direct way to check if a specific job is running
-                        return True
-            return False
-
-        except Exception as e:
-            logger.error(f"Error checking if job is running: {e}")
-            return False
+        return self._in_flight > 0
 
     def get_job_history(self, limit: int = 10) -> list[Dict[str, Any]]:
         """
-        Get history of job executions.
-        Note: This is a simple implementation that only stores the last result.
-        For production, you might want to implement persistent job history storage.
+        Get history of job executions, most recent first.
+        Only the last JOB_HISTORY_SIZE results are kept, in memory.
 
         Args:
             limit: Maximum number of history entries to return
@@ -318,12 +410,7 @@ class DailyScheduler:
         Returns:
             List of job execution history
         """
-        history = []
-
-        if self.last_run_result:
-            history.append(self.last_run_result)
-
-        return history[:limit]
+        return list(islice(reversed(self._history), limit))
 
     def wait_for_completion(self, timeout: int = 300) -> bool:
         """
@@ -335,12 +422,7 @@ class DailyScheduler:
         Returns:
             True if job completed or wasn't running, False if timeout
         """
-        start_time = time.time()
-
-        while self.is_job_running() and (time.time() - start_time) < timeout:
-            time.sleep(1)
-
-        return not self.is_job_running()
+        return self._completion_event.wait(timeout) or not self.is_job_running()
 
     def __enter__(self):
         """Context manager entry."""
@@ -4,15 +4,18 @@ This provides a user-friendly interface for subscription management.
 """
 
 import streamlit as st
+import pandas as pd
 import sys
 import os
+import re
+from collections import OrderedDict
+from html import escape
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Add the src directory to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.coordinator import LeetcodeEmailCoordinator
 from src.config import Config
 
 # Page configuration
@@ -23,8 +26,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling, injected once per run by _inject_css()
+CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -58,34 +61,155 @@ st.markdown("""
         color: #0c5460;
         margin: 1rem 0;
     }
-    .stat-card {
-        background-color: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 8px;
-        border-left: 4px solid #007bff;
-        margin: 1rem 0;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Selectbox options and labels, built once since Config values are static
+LANG_KEYS = tuple(Config.SUPPORTED_LANGUAGES.keys())
+DIFF_KEYS = tuple(Config.DIFFICULTY_LEVELS.keys())
+LANG_KEYS_WITH_BLANK = ("",) + LANG_KEYS
+DIFF_KEYS_WITH_BLANK = ("",) + DIFF_KEYS
+LANG_LABELS_WITH_BLANK = {"": "Keep current", **Config.SUPPORTED_LANGUAGES}
+DIFF_LABELS_WITH_BLANK = {"": "Keep current", **Config.DIFFICULTY_LEVELS}
+
+# "Supported Features" bullet lists, rendered as one markdown element each
+LANG_MD = "**Programming Languages:**\n" + "\n".join(f"- {name}" for name in Config.SUPPORTED_LANGUAGES.values())
+DIFF_MD = "**Difficulty Levels:**\n" + "\n".join(f"- {name}" for name in Config.DIFFICULTY_LEVELS.values())
+
+# Result boxes shown after a form submission
+_SUCCESS_TMPL = '<div class="success-box"><h4>{title}</h4>{body}</div>'
+_ERROR_TMPL = '<div class="error-box"><h4>{title}</h4>{body}</div>'
+
+# How many successful form submissions each session remembers, so an
+# accidental resubmit doesn't repeat the same write
+SUBMISSION_HISTORY_SIZE = 32
+
+# Same light email check the coordinator applies before adding a user
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# How long (seconds) the UI caches statistics and health check results
+USER_STATS_TTL_SECONDS = 30
+SYSTEM_STATS_TTL_SECONDS = 30
+HEALTH_TTL_SECONDS = 15
+CONFIG_CHECK_TTL_SECONDS = 300
+
+# Static header and footer markup
+HEADER_HTML = """
+<div class="main-header">
+    <h1>LeetCode Email AI Agent</h1>
+    <p>Daily coding challenges delivered to your inbox with humor!</p>
+</div>
+"""
+
+FOOTER_HTML = """
+<div style="text-align: center; color: #666; padding: 2rem;">
+    <p>🚀 LeetCode Email Agent - Making coding practice fun, one email at a time!</p>
+    <p><small>Built with ❤️ using Streamlit, Groq, and lots of coffee ☕</small></p>
+</div>
+"""
+
+@st.cache_resource
+def _inject_css() -> bool:
+    """Emit the custom CSS (cached, so Streamlit replays the element on reruns)."""
+    st.markdown(CSS, unsafe_allow_html=True)
+    return True
 
 @st.cache_resource
 def get_coordinator():
     """Get the coordinator instance (cached for performance)."""
     try:
+        # Imported here so the backend is only loaded once a page needs it
+        from src.coordinator import LeetcodeEmailCoordinator
         return LeetcodeEmailCoordinator()
     except Exception as e:
         st.error(f"Failed to initialize system: {e}")
         return None
 
+@st.cache_data(ttl=USER_STATS_TTL_SECONDS)
+def _cached_user_stats(email: str) -> Optional[Dict[str, Any]]:
+    """Get a user's statistics (cached per email), with the join date preformatted."""
+    coordinator = get_coordinator()
+    stats = coordinator.get_user_stats(email) if coordinator else None
+
+    if stats and stats.get('created_at'):
+        try:
+            stats['_created_display'] = datetime.fromisoformat(stats['created_at']).strftime("%B %d, %Y")
+        except ValueError:
+            stats['_created_display'] = stats['created_at']
+
+    return stats
+
+@st.cache_data(ttl=SYSTEM_STATS_TTL_SECONDS)
+def _cached_system_stats() -> Dict[str, Any]:
+    """Get the overall system statistics (cached)."""
+    coordinator = get_coordinator()
+    return coordinator.get_system_stats() if coordinator else {}
+
+@st.cache_data(ttl=HEALTH_TTL_SECONDS)
+def _cached_health() -> Dict[str, bool]:
+    """Run the system health checks (cached)."""
+    coordinator = get_coordinator()
+    return coordinator.test_system_health() if coordinator else {}
+
+@st.cache_data(ttl=CONFIG_CHECK_TTL_SECONDS)
+def _cfg_valid() -> bool:
+    """Validate the configuration (cached, so it doesn't run on every rerun)."""
+    return Config.validate_config()
+
+def _invalidate_stats():
+    """Drop cached statistics after a subscription change."""
+    _cached_user_stats.clear()
+    _cached_system_stats.clear()
+
+def _success(title: str, body_html: str):
+    """Render a success box."""
+    st.markdown(_SUCCESS_TMPL.format(title=title, body=body_html), unsafe_allow_html=True)
+
+def _error(title: str, body_html: str):
+    """Render an error box."""
+    st.markdown(_ERROR_TMPL.format(title=title, body=body_html), unsafe_allow_html=True)
+
+def _submissions() -> OrderedDict:
+    """Get this session's record of successful form submissions."""
+    return st.session_state.setdefault("_submissions", OrderedDict())
+
+def _already_submitted(key: tuple) -> bool:
+    """Check whether an identical submission already succeeded this session."""
+    if key in _submissions():
+        st.info("ℹ️ This request was already submitted.")
+        return True
+    return False
+
+def _remember_submission(key: tuple):
+    """
+    Record a successful submission, keyed by (action, email, ...).
+    Earlier submissions for the same email are dropped since they no longer
+    reflect that user's state (e.g. subscribe after unsubscribe).
+    """
+    submissions = _submissions()
+    for old_key in [k for k in submissions if k[1] == key[1]]:
+        del submissions[old_key]
+    submissions[key] = True
+    while len(submissions) > SUBMISSION_HISTORY_SIZE:
+        submissions.popitem(last=False)
+
+def _is_valid_email(email: str) -> bool:
+    """Check that an email address looks well formed."""
+    return bool(email) and EMAIL_RE.match(email) is not None
+
+def _email_error(email: str) -> Optional[str]:
+    """Return the validation message for an email field, or None if it's valid."""
+    if not email:
+        return "Please enter your email address"
+    if not _is_valid_email(email):
+        return "Please enter a valid email address"
+    return None
+
 def show_header():
     """Display the main header."""
-    st.markdown("""
-    <div class="main-header">
-        <h1>LeetCode Email AI Agent</h1>
-        <p>Daily coding challenges delivered to your inbox with humor!</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
+@st.fragment
 def show_subscription_form():
     """Display the subscription form."""
     st.header("📧 Subscribe to Daily Challenges")
@@ -102,16 +226,16 @@ def show_subscription_form():
 
             language = st.selectbox(
                 "Preferred Programming Language",
-                options=list(Config.SUPPORTED_LANGUAGES.keys()),
-                format_func=lambda x: Config.SUPPORTED_LANGUAGES[x],
+                options=LANG_KEYS,
+                format_func=Config.SUPPORTED_LANGUAGES.__getitem__,
                 help="Choose your preferred programming language for solutions"
             )
 
         with col2:
             difficulty = st.selectbox(
                 "Preferred Difficulty",
-                options=list(Config.DIFFICULTY_LEVELS.keys()),
-                format_func=lambda x: Config.DIFFICULTY_LEVELS[x],
+                options=DIFF_KEYS,
+                format_func=Config.DIFFICULTY_LEVELS.__getitem__,
                 help="Choose your preferred problem difficulty level"
             )
 
@@ -126,35 +250,31 @@ def show_subscription_form():
         submitted = st.form_submit_button("🚀 Subscribe Now!", use_container_width=True)
 
         if submitted:
-            if not email:
-                st.error("Please enter your email address")
-            elif "@" not in email:
-                st.error("Please enter a valid email address")
-            else:
+            email_error = _email_error(email)
+            if email_error:
+                st.error(email_error)
+            elif not _already_submitted(("subscribe", email, language, difficulty)):
                 coordinator = get_coordinator()
                 if coordinator:
                     success = coordinator.add_user(email, language, difficulty)
                     if success:
-                        st.markdown(f"""
-                        <div class="success-box">
-                            <h4>🎉 Welcome aboard!</h4>
-                            <p>You've successfully subscribed to daily LeetCode challenges!</p>
-                            <ul>
-                                <li><strong>Email:</strong> {email}</li>
-                                <li><strong>Language:</strong> {Config.SUPPORTED_LANGUAGES[language]}</li>
-                                <li><strong>Difficulty:</strong> {Config.DIFFICULTY_LEVELS[difficulty]}</li>
-                            </ul>
-                            <p>Your first challenge will arrive tomorrow morning. Get ready to code! 🚀</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        _remember_submission(("subscribe", email, language, difficulty))
+                        _invalidate_stats()
+                        _success(
+                            "🎉 Welcome aboard!",
+                            "<p>You've successfully subscribed to daily LeetCode challenges!</p>"
+                            f"<ul><li><strong>Email:</strong> {escape(email)}</li>"
+                            f"<li><strong>Language:</strong> {Config.SUPPORTED_LANGUAGES[language]}</li>"
+                            f"<li><strong>Difficulty:</strong> {Config.DIFFICULTY_LEVELS[difficulty]}</li></ul>"
+                            "<p>Your first challenge will arrive tomorrow morning. Get ready to code! 🚀</p>"
+                        )
                     else:
-                        st.markdown("""
-                        <div class="error-box">
-                            <h4>❌ Subscription Failed</h4>
-                            <p>You might already be subscribed or there was an error. Please try again or contact support.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        _error(
+                            "❌ Subscription Failed",
+                            "<p>You might already be subscribed or there was an error. Please try again or contact support.</p>"
+                        )
 
+@st.fragment
 def show_unsubscribe_form():
     """Display the unsubscribe form."""
     st.header("👋 Unsubscribe")
@@ -169,30 +289,28 @@ def show_unsubscribe_form():
         submitted = st.form_submit_button("Unsubscribe", use_container_width=True)
 
         if submitted:
-            if not email:
-                st.error("Please enter your email address")
-            elif "@" not in email:
-                st.error("Please enter a valid email address")
-            else:
+            email_error = _email_error(email)
+            if email_error:
+                st.error(email_error)
+            elif not _already_submitted(("unsubscribe", email)):
                 coordinator = get_coordinator()
                 if coordinator:
                     success = coordinator.remove_user(email)
                     if success:
-                        st.markdown(f"""
-                        <div class="success-box">
-                            <h4>✅ Successfully Unsubscribed</h4>
-                            <p>You have been unsubscribed from daily LeetCode challenges.</p>
-                            <p>We're sorry to see you go! You can always resubscribe anytime.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        _remember_submission(("unsubscribe", email))
+                        _invalidate_stats()
+                        _success(
+                            "✅ Successfully Unsubscribed",
+                            "<p>You have been unsubscribed from daily LeetCode challenges.</p>"
+                            "<p>We're sorry to see you go! You can always resubscribe anytime.</p>"
+                        )
                     else:
-                        st.markdown("""
-                        <div class="error-box">
-                            <h4>❌ Unsubscribe Failed</h4>
-                            <p>Email not found or already unsubscribed. Please check your email address.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        _error(
+                            "❌ Unsubscribe Failed",
+                            "<p>Email not found or already unsubscribed. Please check your email address.</p>"
+                        )
 
+@st.fragment
 def show_update_preferences_form():
     """Display the update preferences form."""
     st.header("⚙️ Update Preferences")
@@ -209,29 +327,28 @@ def show_update_preferences_form():
         with col1:
             language = st.selectbox(
                 "New Programming Language",
-                options=[""] + list(Config.SUPPORTED_LANGUAGES.keys()),
-                format_func=lambda x: "Keep current" if x == "" else Config.SUPPORTED_LANGUAGES[x],
+                options=LANG_KEYS_WITH_BLANK,
+                format_func=LANG_LABELS_WITH_BLANK.__getitem__,
                 help="Choose new preferred programming language (leave as 'Keep current' to not change)"
             )
 
         with col2:
             difficulty = st.selectbox(
                 "New Difficulty Level",
-                options=[""] + list(Config.DIFFICULTY_LEVELS.keys()),
-                format_func=lambda x: "Keep current" if x == "" else Config.DIFFICULTY_LEVELS[x],
+                options=DIFF_KEYS_WITH_BLANK,
+                format_func=DIFF_LABELS_WITH_BLANK.__getitem__,
                 help="Choose new preferred difficulty level (leave as 'Keep current' to not change)"
             )
 
         submitted = st.form_submit_button("Update Preferences", use_container_width=True)
 
         if submitted:
-            if not email:
-                st.error("Please enter your email address")
-            elif "@" not in email:
-                st.error("Please enter a valid email address")
+            email_error = _email_error(email)
+            if email_error:
+                st.error(email_error)
             elif not language and not difficulty:
                 st.warning("Please select at least one preference to update")
-            else:
+            elif not _already_submitted(("update", email, language, difficulty)):
                 coordinator = get_coordinator()
                 if coordinator:
                     # Convert empty strings to None
@@ -240,21 +357,20 @@ def show_update_preferences_form():
 
                     success = coordinator.update_user_preferences(email, new_language, new_difficulty)
                     if success:
-                        st.markdown(f"""
-                        <div class="success-box">
-                            <h4>✅ Preferences Updated</h4>
-                            <p>Your preferences have been successfully updated!</p>
-                            <p>Changes will take effect with your next daily challenge.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        _remember_submission(("update", email, language, difficulty))
+                        _invalidate_stats()
+                        _success(
+                            "✅ Preferences Updated",
+                            "<p>Your preferences have been successfully updated!</p>"
+                            "<p>Changes will take effect with your next daily challenge.</p>"
+                        )
                     else:
-                        st.markdown("""
-                        <div class="error-box">
-                            <h4>❌ Update Failed</h4>
-                            <p>Email not found or there was an error. Please check your email address.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        _error(
+                            "❌ Update Failed",
+                            "<p>Email not found or there was an error. Please check your email address.</p>"
+                        )
 
+@st.fragment
 def show_user_stats():
     """Display user statistics lookup."""
     st.header("📊 User Statistics")
@@ -269,51 +385,41 @@ def show_user_stats():
         submitted = st.form_submit_button("Get My Stats", use_container_width=True)
 
         if submitted:
-            if not email:
-                st.error("Please enter your email address")
-            elif "@" not in email:
-                st.error("Please enter a valid email address")
+            email_error = _email_error(email)
+            if email_error:
+                st.error(email_error)
             else:
                 coordinator = get_coordinator()
                 if coordinator:
-                    stats = coordinator.get_user_stats(email)
+                    stats = _cached_user_stats(email)
                     if stats:
                         col1, col2, col3 = st.columns(3)
 
                         with col1:
-                            st.markdown(f"""
-                            <div class="stat-card">
-                                <h4>📧 Total Problems Sent</h4>
-                                <h2>{stats.get('total_sent', 0)}</h2>
-                            </div>
-                            """, unsafe_allow_html=True)
+                            st.metric("📧 Total Problems Sent", stats.get('total_sent', 0))
 
                         with col2:
-                            st.markdown(f"""
-                            <div class="stat-card">
-                                <h4>💻 Preferred Language</h4>
-                                <h3>{Config.SUPPORTED_LANGUAGES.get(stats.get('preferred_language', 'python'), 'Python')}</h3>
-                            </div>
-                            """, unsafe_allow_html=True)
+                            st.metric(
+                                "💻 Preferred Language",
+                                Config.SUPPORTED_LANGUAGES.get(stats.get('preferred_language', 'python'), 'Python')
+                            )
 
                         with col3:
-                            st.markdown(f"""
-                            <div class="stat-card">
-                                <h4>🎯 Preferred Difficulty</h4>
-                                <h3>{Config.DIFFICULTY_LEVELS.get(stats.get('preferred_difficulty', 'medium'), 'Medium')}</h3>
-                            </div>
-                            """, unsafe_allow_html=True)
+                            st.metric(
+                                "🎯 Preferred Difficulty",
+                                Config.DIFFICULTY_LEVELS.get(stats.get('preferred_difficulty', 'medium'), 'Medium')
+                            )
 
                         # Difficulty breakdown
                         if stats.get('by_difficulty'):
                             st.subheader("📈 Problems by Difficulty")
                             difficulty_data = stats['by_difficulty']
 
-                            for diff, count in difficulty_data.items():
-                                st.metric(
-                                    label=Config.DIFFICULTY_LEVELS.get(diff, diff.title()),
-                                    value=count
-                                )
+                            df = pd.DataFrame({
+                                "Difficulty": [Config.DIFFICULTY_LEVELS.get(k, k.title()) for k in difficulty_data],
+                                "Count": list(difficulty_data.values())
+                            })
+                            st.dataframe(df, hide_index=True, use_container_width=True)
 
                         # Account info
                         st.subheader("👤 Account Information")
@@ -324,29 +430,23 @@ def show_user_stats():
                             st.write(f"**Status:** {'Active' if stats.get('is_active', False) else 'Inactive'}")
 
                         with col2:
-                            created_at = stats.get('created_at')
-                            if created_at:
-                                try:
-                                    created_date = datetime.fromisoformat(created_at).strftime("%B %d, %Y")
-                                    st.write(f"**Member Since:** {created_date}")
-                                except:
-                                    st.write(f"**Member Since:** {created_at}")
+                            if stats.get('_created_display'):
+                                st.write(f"**Member Since:** {stats['_created_display']}")
                     else:
-                        st.markdown("""
-                        <div class="error-box">
-                            <h4>❌ User Not Found</h4>
-                            <p>No user found with that email address. Please check your email or subscribe first.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        _error(
+                            "❌ User Not Found",
+                            "<p>No user found with that email address. Please check your email or subscribe first.</p>"
+                        )
 
+@st.fragment
 def show_system_stats():
     """Display system statistics."""
     st.header("🔧 System Statistics")
 
-    coordinator = get_coordinator()
-    if coordinator:
-        stats = coordinator.get_system_stats()
-        health = coordinator.test_system_health()
+    # The live sections need the coordinator, so only build it on request
+    if st.toggle("Load live health and usage statistics", value=False) and get_coordinator():
+        stats = _cached_system_stats()
+        health = _cached_health()
 
         # System health
         st.subheader("🏥 System Health")
@@ -383,39 +483,40 @@ def show_system_stats():
         with col2:
             # Problems by difficulty
             problems_by_diff = stats.get('problems_by_difficulty', {})
-            for diff, count in problems_by_diff.items():
-                st.metric(f"{diff.title()} Problems", count)
-
-        # Supported features
-        st.subheader("🛠️ Supported Features")
-        col1, col2 = st.columns(2)
+            if problems_by_diff:
+                df = pd.DataFrame({
+                    "Difficulty": [Config.DIFFICULTY_LEVELS.get(k, k.title()) for k in problems_by_diff],
+                    "Problems": list(problems_by_diff.values())
+                })
+                st.dataframe(df, hide_index=True, use_container_width=True)
+
+    # Supported features
+    st.subheader("🛠️ Supported Features")
+    col1, col2 = st.columns(2)
 
-        with col1:
-            st.write("**Programming Languages:**")
-            for lang_key, lang_name in Config.SUPPORTED_LANGUAGES.items():
-                st.write(f"• {lang_name}")
+    with col1:
+        st.markdown(LANG_MD)
 
-        with col2:
-            st.write("**Difficulty Levels:**")
-            for diff_key, diff_name in Config.DIFFICULTY_LEVELS.items():
-                st.write(f"• {diff_name}")
+    with col2:
+        st.markdown(DIFF_MD)
 
 def show_admin_panel():
     """Display admin panel for testing."""
     st.header("🔧 Admin Panel")
 
-    coordinator = get_coordinator()
-    if not coordinator:
-        st.error("System not available")
-        return
-
     # Manual job execution
     st.subheader("🚀 Manual Operations")
 
     col1, col2 = st.columns(2)
 
+    # The coordinator is only created once an operation is requested
     with col1:
         if st.button("Send Test Emails Now", use_container_width=True):
+            coordinator = get_coordinator()
+            if not coordinator:
+                st.error("System not available")
+                return
+
             with st.spinner("Processing emails..."):
                 result = coordinator.process_daily_emails()
 
@@ -432,6 +533,11 @@ def show_admin_panel():
 
     with col2:
         if st.button("Initialize Sample Data", use_container_width=True):
+            coordinator = get_coordinator()
+            if not coordinator:
+                st.error("System not available")
+                return
+
             with st.spinner("Loading sample problems..."):
                 success = coordinator.initialize_sample_data()
 
@@ -440,29 +546,62 @@ def show_admin_panel():
                 else:
                     st.error("❌ Failed to initialize sample data")
 
+def show_home():
+    """Display the subscription form plus an overview of the service."""
+    show_subscription_form()
+
+    # Show some info about the service
+    st.markdown("---")
+    st.subheader("🎯 How It Works")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("""
+        ### 📧 Subscribe
+        Enter your email and preferences to start receiving daily coding challenges.
+        """)
+
+    with col2:
+        st.markdown("""
+        ### 🧠 Solve
+        Each morning, get a new problem with detailed solutions and funny comments.
+        """)
+
+    with col3:
+        st.markdown("""
+        ### 🚀 Improve
+        Build your coding skills one problem at a time with consistent practice.
+        """)
+
+# Sidebar pages and the functions that render them
+PAGES = {
+    "🏠 Home & Subscribe": show_home,
+    "👋 Unsubscribe": show_unsubscribe_form,
+    "⚙️ Update Preferences": show_update_preferences_form,
+    "📊 My Statistics": show_user_stats,
+    "🔧 System Status": show_system_stats,
+    "🛠️ Admin Panel": show_admin_panel
+}
+PAGE_NAMES = tuple(PAGES)
+
 def main():
     """Main application function."""
+    _inject_css()
     show_header()
 
     # Sidebar navigation
     st.sidebar.title("🧭 Navigation")
-    page = st.sidebar.selectbox(
-        "Choose a page:",
-        [
-            "🏠 Home & Subscribe",
-            "👋 Unsubscribe",
-            "⚙️ Update Preferences",
-            "📊 My Statistics",
-            "🔧 System Status",
-            "🛠️ Admin Panel"
-        ]
-    )
+    page = st.sidebar.selectbox("Choose a page:", PAGE_NAMES)
 
     # Show configuration status in sidebar
     st.sidebar.markdown("---")
     st.sidebar.subheader("⚙️ Configuration")
 
-    config_valid = Config.validate_config()
+    if st.sidebar.button("🔄 Recheck"):
+        _cfg_valid.clear()
+
+    config_valid = _cfg_valid()
     if config_valid:
         st.sidebar.success("✅ Configuration Valid")
     else:
@@ -479,56 +618,11 @@ def main():
         """, unsafe_allow_html=True)
 
     # Display selected page
-    if page == "🏠 Home & Subscribe":
-        show_subscription_form()
-
-        # Show some info about the service
-        st.markdown("---")
-        st.subheader("🎯 How It Works")
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.markdown("""
-            ### 📧 Subscribe
-            Enter your email and preferences to start receiving daily coding challenges.
-            """)
-
-        with col2:
-            st.markdown("""
-            ### 🧠 Solve
-            Each morning, get a new problem with detailed solutions and funny comments.
-            """)
-
-        with col3:
-            st.markdown("""
-            ### 🚀 Improve
-            Build your coding skills one problem at a time with consistent practice.
-            """)
-
-    elif page == "👋 Unsubscribe":
-        show_unsubscribe_form()
-
-    elif page == "⚙️ Update Preferences":
-        show_update_preferences_form()
-
-    elif page == "📊 My Statistics":
-        show_user_stats()
-
-    elif page == "🔧 System Status":
-        show_system_stats()
-
-    elif page == "🛠️ Admin Panel":
-        show_admin_panel()
+    PAGES[page]()
 
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style="text-align: center; color: #666; padding: 2rem;">
-        <p>🚀 LeetCode Email Agent - Making coding practice fun, one email at a time!</p>
-        <p><small>Built with ❤️ using Streamlit, Groq, and lots of coffee ☕</small></p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()